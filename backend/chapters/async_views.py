@@ -0,0 +1,94 @@
+"""
+Async versions of the read-heavy endpoints, routed instead of the sync ones
+when the project runs under ASGI (see ``ASYNC_VIEWS`` and studyflow.urls).
+
+A request waiting on Postgres then only holds a coroutine, not a worker.
+Responses match the sync views: same JSON, errors and validators.
+"""
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+
+from common.conditional import set_validators, validators
+from common.renderers import FastJSONRenderer
+from .decks import abuild_deck, deck_params
+from .models import Chapter
+from .search import asearch_catalog, search_params
+from .serializers import ChapterSerializer
+from .views import ChapterViewSet
+
+renderer = FastJSONRenderer()
+
+chapter_viewset_detail = ChapterViewSet.as_view({
+    'get': 'retrieve',
+    'put': 'update',
+    'patch': 'partial_update',
+    'delete': 'destroy',
+})
+
+
+def _json(data, status=200):
+    return HttpResponse(
+        renderer.render(data), status=status, content_type='application/json'
+    )
+
+
+def _error(message):
+    return _json({'error': message}, status=400)
+
+
+@require_GET
+async def search(request):
+    """Async counterpart of chapters.views.search."""
+    try:
+        query, limit, types = search_params(request.GET)
+    except ValueError as exc:
+        return _error(str(exc))
+    if not query:
+        return _json({'query': query, 'results': []})
+
+    return _json({
+        'query': query,
+        'results': await asearch_catalog(query, limit=limit, types=types),
+    })
+
+
+@require_GET
+async def decks(request):
+    """Async counterpart of chapters.views.decks."""
+    try:
+        chapter_ids, card_type, sample, seed = deck_params(request.GET)
+    except ValueError as exc:
+        return _error(str(exc))
+
+    return _json(await abuild_deck(chapter_ids, card_type, sample=sample, seed=seed))
+
+
+@csrf_exempt  # the delegated DRF view enforces CSRF itself
+async def chapter_detail(request, pk):
+    """
+    Async ``GET /api/chapters/<pk>/``. Writes and non-JSON formats (the
+    browsable API) are handed to the sync ChapterViewSet.
+    """
+    if request.method not in ('GET', 'HEAD') or request.GET.get('format', 'json') != 'json':
+        return await sync_to_async(chapter_viewset_detail)(request, pk=pk)
+
+    chapters = Chapter.objects.filter(pk=pk)
+    state = await chapters.order_by().aaggregate(
+        count=Count('pk'), last_modified=Max('updated_at')
+    )
+    if not state['count']:
+        return _json({'detail': 'Not found.'}, status=404)
+
+    etag, last_modified = validators(request, 'json', state['count'], state['last_modified'])
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        chapter = await chapters.with_tree().afirst()
+        if chapter is None:  # deleted since the aggregate
+            return _json({'detail': 'Not found.'}, status=404)
+        response = _json(ChapterSerializer(chapter).data)
+    set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,92 @@
+import random
+
+from .models import Vocabulary, GrammarPattern
+from .serializers import VocabularySerializer, GrammarPatternSerializer
+
+MAX_DECK_CHAPTERS = 100
+MAX_SEED = 2 ** 31 - 1
+
+
+CARD_TYPES = {
+    'vocabulary': (Vocabulary.objects.all, VocabularySerializer),
+    'grammar': (GrammarPattern.objects.with_usages, GrammarPatternSerializer),
+}
+
+
+def deck_queryset(chapter_ids, card_type):
+    """All cards of ``card_type`` in the given chapters, in a stable order."""
+    get_queryset, _ = CARD_TYPES[card_type]
+    return get_queryset().filter(chapter__in=chapter_ids).order_by('chapter', 'id')
+
+
+def shuffle_deck(cards, sample=None, seed=None):
+    """
+    Shuffle ``cards`` with ``seed`` (a random one is drawn when omitted) and
+    keep at most ``sample`` of them. The same seed and deck always produce
+    the same order. Returns ``(cards, seed)``.
+    """
+    if seed is None:
+        seed = random.randint(0, MAX_SEED)
+    rng = random.Random(seed)
+    cards = list(cards)
+    if sample is not None and sample < len(cards):
+        cards = rng.sample(cards, sample)
+    else:
+        rng.shuffle(cards)
+    return cards, seed
+
+
+def deck_params(params):
+    """
+    Validate the ``type``, ``chapters``, ``sample`` and ``seed`` query
+    params. Returns ``(chapter_ids, card_type, sample, seed)``; raises
+    ValueError with a message for the client.
+    """
+    card_type = params.get('type', 'vocabulary')
+    if card_type not in CARD_TYPES:
+        raise ValueError(f'Unknown card type: {card_type}')
+
+    try:
+        chapter_ids = [
+            int(chapter_id)
+            for chapter_id in params.get('chapters', '').split(',')
+            if chapter_id.strip()
+        ]
+        sample = params.get('sample')
+        sample = int(sample) if sample else None
+        seed = params.get('seed')
+        seed = int(seed) if seed else None
+    except ValueError:
+        raise ValueError('chapters, sample and seed must be integers')
+
+    if not chapter_ids:
+        raise ValueError('Missing required field: chapters')
+    if len(chapter_ids) > MAX_DECK_CHAPTERS:
+        raise ValueError(f'At most {MAX_DECK_CHAPTERS} chapters per deck')
+    if sample is not None and sample < 1:
+        raise ValueError('sample must be positive')
+    return chapter_ids, card_type, sample, seed
+
+
+def _deck(chapter_ids, card_type, cards, sample, seed):
+    _, serializer_class = CARD_TYPES[card_type]
+    cards, seed = shuffle_deck(cards, sample=sample, seed=seed)
+    return {
+        'type': card_type,
+        'chapters': chapter_ids,
+        'seed': seed,
+        'count': len(cards),
+        'cards': serializer_class(cards, many=True).data,
+    }
+
+
+def build_deck(chapter_ids, card_type, sample=None, seed=None):
+    """Load, shuffle and serialize a multi-chapter deck."""
+    cards = deck_queryset(chapter_ids, card_type)
+    return _deck(chapter_ids, card_type, cards, sample, seed)
+
+
+async def abuild_deck(chapter_ids, card_type, sample=None, seed=None):
+    """build_deck() on the async ORM."""
+    cards = [card async for card in deck_queryset(chapter_ids, card_type)]
+    return _deck(chapter_ids, card_type, cards, sample, seed)
@@ -0,0 +1,22 @@
+from django.db.models import Q
+from rest_framework import filters
+
+from .search import normalized_match
+
+
+class NormalizedSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter that also matches the normalized search keys of
+    SearchKeysModel rows (kana/width folding and romaji).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+
+        matched = super().filter_queryset(request, queryset, view)
+        condition = normalized_match(' '.join(search_terms))
+        if not condition:
+            return matched
+        return queryset.filter(condition | Q(pk__in=matched.values('pk')))
@@ -0,0 +1,210 @@
+import csv
+import io
+import os
+import re
+
+from django.db import transaction
+
+from common.cache import invalidate
+from .models import Chapter, Vocabulary
+from .signals import touch_chapters
+
+BATCH_SIZE = 500
+
+CHAPTER_NUMBER_RE = re.compile(r'Chapter\s+(\d+)', re.IGNORECASE)
+
+# Header keywords, matched case-insensitively as substrings (same rules the
+# browser importer used).
+WORD_HEADERS = ('word', 'từ', 'vocabulary')
+MEANING_HEADERS = ('meaning', 'nghĩa', 'definition')
+EXAMPLE_HEADERS = ('example', 'translation')
+
+WORD_MAX_LENGTH = Vocabulary._meta.get_field('word').max_length
+
+
+class ImportFileError(ValueError):
+    """Raised when the uploaded file cannot be read at all."""
+
+
+def _find_column(header, keywords):
+    for index, title in enumerate(header):
+        title = str(title or '').strip().lower()
+        if any(keyword in title for keyword in keywords):
+            return index
+    return None
+
+
+def _cell(row, index):
+    if index is None or index >= len(row) or row[index] is None:
+        return ''
+    return str(row[index]).strip()
+
+
+def _csv_rows(text):
+    reader = csv.reader(text)
+    try:
+        for row in reader:
+            yield tuple(row)
+    except UnicodeDecodeError as e:
+        raise ImportFileError(
+            f'CSV files must be UTF-8 encoded (line {reader.line_num + 1} is not); '
+            f'save the file as "CSV UTF-8" and upload it again'
+        ) from e
+    except csv.Error as e:
+        raise ImportFileError(f'Could not read CSV line {reader.line_num}: {e}') from e
+
+
+def _worksheet_rows(worksheet):
+    try:
+        yield from worksheet.iter_rows(values_only=True)
+    except Exception as e:
+        raise ImportFileError(f'Could not read sheet "{worksheet.title}": {e}') from e
+
+
+def iter_sheets(upload):
+    """
+    Yield ``(sheet_name, rows)`` for every sheet of an uploaded .xlsx or .csv
+    file. ``rows`` is a lazy iterator of tuples, so a sheet is never fully
+    loaded into memory; errors while reading it raise ImportFileError.
+    """
+    name, extension = os.path.splitext(upload.name or '')
+    extension = extension.lower()
+
+    if extension == '.csv':
+        text = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+        yield name, _csv_rows(text)
+        return
+
+    if extension not in ('.xlsx', '.xlsm'):
+        raise ImportFileError(f'Unsupported file type: {extension or "unknown"}')
+
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(upload.file, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportFileError(f'Could not read workbook: {e}') from e
+    try:
+        for worksheet in workbook.worksheets:
+            yield worksheet.title, _worksheet_rows(worksheet)
+    finally:
+        workbook.close()
+
+
+def chapter_number_for_sheet(sheet_name, sheet_index):
+    """Parse "Chapter 26" -> 26, else fall back to the 1-based sheet position."""
+    match = CHAPTER_NUMBER_RE.search(sheet_name)
+    return int(match.group(1)) if match else sheet_index + 1
+
+
+def _import_sheet(sheet_name, rows, chapter, batch_size):
+    report = {
+        'sheet': sheet_name,
+        'chapter': chapter.id,
+        'chapter_number': chapter.chapter_number,
+        'created': 0,
+        'failed': [],
+    }
+
+    header = next(rows, None)
+    if header is None:
+        return report
+    word_column = _find_column(header, WORD_HEADERS)
+    meaning_column = _find_column(header, MEANING_HEADERS)
+    example_column = _find_column(header, EXAMPLE_HEADERS)
+    if word_column is None or meaning_column is None:
+        report['failed'].append({
+            'row': 1,
+            'error': 'Missing word or meaning column'
+        })
+        return report
+
+    batch = []
+    # Row numbers are 1-based and count the header, like a spreadsheet
+    for row_number, row in enumerate(rows, start=2):
+        word = _cell(row, word_column)
+        meaning = _cell(row, meaning_column)
+        if not word and not meaning:
+            continue
+        if not word or not meaning:
+            report['failed'].append({
+                'row': row_number,
+                'error': 'Empty word or meaning'
+            })
+            continue
+        if len(word) > WORD_MAX_LENGTH:
+            report['failed'].append({
+                'row': row_number,
+                'error': f'Word is longer than {WORD_MAX_LENGTH} characters'
+            })
+            continue
+
+        vocabulary = Vocabulary(
+            chapter=chapter,
+            word=word,
+            meaning=meaning,
+            example=_cell(row, example_column),
+        )
+        # bulk_create skips save(), so compute the search keys here
+        vocabulary.update_search_keys()
+        batch.append(vocabulary)
+        if len(batch) >= batch_size:
+            Vocabulary.objects.bulk_create(batch)
+            report['created'] += len(batch)
+            batch = []
+
+    if batch:
+        Vocabulary.objects.bulk_create(batch)
+        report['created'] += len(batch)
+    if report['created']:
+        # bulk_create sends no post_save signals
+        touch_chapters(pk=chapter.pk)
+        invalidate('vocabularies', 'chapters', f'chapters:{chapter.pk}')
+    return report
+
+
+def import_vocabulary_file(upload, book_name, level, chapter_number=None,
+                           batch_size=BATCH_SIZE):
+    """
+    Import vocabulary from an uploaded workbook (one chapter per sheet) or CSV
+    file. Missing chapters of ``book_name`` are created with ``level``;
+    ``chapter_number`` overrides the number of the first (or only) sheet.
+
+    Everything runs in one transaction: rows that fail validation are skipped
+    and reported, but a database error rolls the whole import back so no
+    half-imported chapters are left behind.
+    """
+    existing = {
+        chapter.chapter_number: chapter
+        for chapter in Chapter.objects.filter(book_name=book_name)
+    }
+    sheets = []
+
+    with transaction.atomic():
+        for sheet_index, (sheet_name, rows) in enumerate(iter_sheets(upload)):
+            if chapter_number is not None and sheet_index == 0:
+                number = chapter_number
+            else:
+                number = chapter_number_for_sheet(sheet_name, sheet_index)
+
+            chapter = existing.get(number)
+            chapter_created = chapter is None
+            if chapter_created:
+                chapter = Chapter.objects.create(
+                    book_name=book_name,
+                    chapter_number=number,
+                    level=level,
+                )
+                existing[number] = chapter
+
+            report = _import_sheet(sheet_name, rows, chapter, batch_size)
+            report['chapter_created'] = chapter_created
+            sheets.append(report)
+
+    return {
+        'book_name': book_name,
+        'created': sum(sheet['created'] for sheet in sheets),
+        'failed': sum(len(sheet['failed']) for sheet in sheets),
+        'chapters_created': sum(sheet['chapter_created'] for sheet in sheets),
+        'sheets': sheets,
+    }
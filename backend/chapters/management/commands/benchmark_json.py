@@ -0,0 +1,123 @@
+import io
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from chapters.models import Chapter, GrammarExample, GrammarPattern, GrammarUsage, Vocabulary
+from chapters.serializers import ChapterSerializer
+from common import renderers
+from common.renderers import FastJSONParser, FastJSONRenderer
+
+BOOK_NAME = 'JSON benchmark'
+
+
+def _timed(function, repeat):
+    """Median wall time of ``repeat`` calls, in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares stdlib and orjson encode/decode time and payload size on '
+        'the nested chapter tree of a seeded book (rolled back afterwards)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chapters', type=int, default=100)
+        parser.add_argument('--words', type=int, default=50, help='Vocabulary per chapter')
+        parser.add_argument('--patterns', type=int, default=10, help='Grammar patterns per chapter')
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def seed(self, chapter_count, word_count, pattern_count):
+        chapters = Chapter.objects.bulk_create(
+            Chapter(level='N3', book_name=BOOK_NAME, chapter_number=number)
+            for number in range(1, chapter_count + 1)
+        )
+        Vocabulary.objects.bulk_create(
+            Vocabulary(
+                chapter=chapter,
+                word=f'たべもの{index} 食べ物{index}',
+                meaning=f'đồ ăn {index}',
+                example=f'この食べ物はおいしいです。({index})',
+            )
+            for chapter in chapters
+            for index in range(word_count)
+        )
+        patterns = GrammarPattern.objects.bulk_create(
+            GrammarPattern(
+                chapter=chapter,
+                pattern=f'～ている{index}',
+                description='進行中の動作や結果の状態を表す。',
+            )
+            for chapter in chapters
+            for index in range(pattern_count)
+        )
+        usages = GrammarUsage.objects.bulk_create(
+            GrammarUsage(pattern=pattern, explanation='動作の継続', order=order)
+            for pattern in patterns
+            for order in range(2)
+        )
+        GrammarExample.objects.bulk_create(
+            GrammarExample(
+                usage=usage,
+                sentence='今、ご飯を食べています。',
+                translation='Bây giờ tôi đang ăn cơm.',
+                order=order,
+            )
+            for usage in usages
+            for order in range(2)
+        )
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stdout.write(self.style.WARNING(
+                'orjson is not installed; the fast classes fall back to stdlib json'
+            ))
+
+        with transaction.atomic():
+            self.seed(options['chapters'], options['words'], options['patterns'])
+            chapters = (
+                Chapter.objects.filter(book_name=BOOK_NAME)
+                .order_by('chapter_number')
+                .prefetch_related(
+                    'vocabularies',
+                    Prefetch('grammar_patterns', queryset=GrammarPattern.objects.with_usages()),
+                )
+            )
+            data = ChapterSerializer(chapters, many=True).data
+            transaction.set_rollback(True)
+
+        repeat = options['repeat']
+        rows = []
+        for name, renderer, parser in (
+            ('json', JSONRenderer(), JSONParser()),
+            ('orjson', FastJSONRenderer(), FastJSONParser()),
+        ):
+            payload = renderer.render(data)
+            rows.append((
+                name,
+                len(payload),
+                _timed(lambda: renderer.render(data), repeat),
+                _timed(lambda: parser.parse(io.BytesIO(payload)), repeat),
+                payload,
+            ))
+
+        self.stdout.write(f'{"renderer":<10}{"bytes":>12}{"encode ms":>12}{"decode ms":>12}')
+        for name, size, encode_ms, decode_ms, _ in rows:
+            self.stdout.write(f'{name:<10}{size:>12}{encode_ms:>12.2f}{decode_ms:>12.2f}')
+
+        if json.loads(rows[0][4]) != json.loads(rows[1][4]):
+            self.stdout.write(self.style.ERROR('Payloads differ'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Payloads are identical once decoded'))
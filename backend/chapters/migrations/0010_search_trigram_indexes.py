@@ -0,0 +1,45 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:26
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chapters', '0009_remove_grammarusage_examples_alter_vocabulary_word_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='grammarpattern',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('pattern'), name='gin_trgm_ops'), name='grammar_pattern_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='grammarpattern',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('description'), name='gin_trgm_ops'), name='grammar_description_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='grammarusage',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('explanation'), name='gin_trgm_ops'), name='grammar_explanation_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='note_title_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('content'), name='gin_trgm_ops'), name='note_content_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='vocabulary',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('word'), name='gin_trgm_ops'), name='vocabulary_word_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='vocabulary',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('meaning'), name='gin_trgm_ops'), name='vocabulary_meaning_trgm'),
+        ),
+    ]
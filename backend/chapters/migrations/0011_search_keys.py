@@ -0,0 +1,73 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:27
+
+from django.db import migrations, models
+
+from common.japanese import search_keys
+
+BATCH_SIZE = 1000
+
+
+def _backfill(model, source):
+    batch = []
+    for obj in model.objects.only('id', source).iterator(chunk_size=BATCH_SIZE):
+        key, romaji = search_keys(getattr(obj, source))
+        obj.search_key = key[:200]
+        obj.search_romaji = romaji[:600]
+        batch.append(obj)
+        if len(batch) >= BATCH_SIZE:
+            model.objects.bulk_update(batch, ['search_key', 'search_romaji'])
+            batch = []
+    if batch:
+        model.objects.bulk_update(batch, ['search_key', 'search_romaji'])
+
+
+def backfill_search_keys(apps, schema_editor):
+    _backfill(apps.get_model('chapters', 'Vocabulary'), 'word')
+    _backfill(apps.get_model('chapters', 'GrammarPattern'), 'pattern')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chapters', '0010_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grammarpattern',
+            name='search_key',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='grammarpattern',
+            name='search_romaji',
+            field=models.CharField(blank=True, editable=False, max_length=600),
+        ),
+        migrations.AddField(
+            model_name='vocabulary',
+            name='search_key',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='vocabulary',
+            name='search_romaji',
+            field=models.CharField(blank=True, editable=False, max_length=600),
+        ),
+        migrations.RunPython(backfill_search_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='grammarpattern',
+            index=models.Index(fields=['search_key'], name='grammar_search_key_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='grammarpattern',
+            index=models.Index(fields=['search_romaji'], name='grammar_romaji_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='vocabulary',
+            index=models.Index(fields=['search_key'], name='vocabulary_search_key_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='vocabulary',
+            index=models.Index(fields=['search_romaji'], name='vocabulary_romaji_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
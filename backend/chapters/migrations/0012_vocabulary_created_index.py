@@ -0,0 +1,17 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chapters', '0011_search_keys'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vocabulary',
+            index=models.Index(fields=['created_at', 'id'], name='vocabulary_created_idx'),
+        ),
+    ]
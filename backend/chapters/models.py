@@ -1,6 +1,77 @@
 from common.models import BaseModel
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from common import constant
+from common.japanese import search_keys
+
+
+def trigram_index(field, name):
+    """
+    GIN trigram index on UPPER(field), which is what ``icontains`` compiles
+    to on Postgres, so substring search does not scan the table.
+    """
+    return GinIndex(OpClass(Upper(field), name='gin_trgm_ops'), name=name)
+
+
+class SearchKeysModel(models.Model):
+    """
+    Stores normalized search keys (kana/width folded and romaji, see
+    common.japanese) for the ``SEARCH_KEY_SOURCE`` field. Keys are refreshed
+    on save(); bulk writes must call update_search_keys() themselves.
+    """
+    SEARCH_KEY_SOURCE = None
+
+    search_key = models.CharField(max_length=200, blank=True, editable=False)
+    search_romaji = models.CharField(max_length=600, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def update_search_keys(self):
+        key, romaji = search_keys(getattr(self, self.SEARCH_KEY_SOURCE))
+        self.search_key = key[:200]
+        self.search_romaji = romaji[:600]
+
+    def save(self, *args, **kwargs):
+        self.update_search_keys()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and self.SEARCH_KEY_SOURCE in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_key', 'search_romaji'}
+        super().save(*args, **kwargs)
+
+
+class ChapterChildMixin:
+    """
+    Remembers the chapter a row was loaded with, so saves and signal
+    receivers can tell a move to another chapter from an edit (see
+    chapters.signals and InputTestQuestion.save()).
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_chapter_id = instance.__dict__.get('chapter_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.loaded_chapter_id = self.chapter_id
+
+
+class ChapterQuerySet(models.QuerySet):
+    def with_tree(self):
+        """
+        Prefetch the nested tree (vocabularies, grammar patterns, usages and
+        examples) serialized by ChapterSerializer.
+        """
+        return self.prefetch_related(
+            'vocabularies',
+            models.Prefetch(
+                'grammar_patterns',
+                queryset=GrammarPattern.objects.with_usages()
+            ),
+        )
 
 
 class Chapter(BaseModel):
@@ -8,6 +79,8 @@ class Chapter(BaseModel):
     book_name = models.CharField(max_length=200)
     chapter_number = models.IntegerField(default=0)
 
+    objects = ChapterQuerySet.as_manager()
+
     class Meta:
         ordering = ['level', 'chapter_number']
         unique_together = ('book_name', 'chapter_number')
@@ -15,8 +88,24 @@ class Chapter(BaseModel):
     def __str__(self):
         return f"{self.book_name} - {self.level} - {self.chapter_number}"
 
+    # The loaded book_name/chapter_number tell practice.signals whether a
+    # save renamed the chapter
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.loaded_book_name = instance.__dict__.get('book_name')
+        instance.loaded_chapter_number = instance.__dict__.get('chapter_number')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.loaded_book_name = self.book_name
+        self.loaded_chapter_number = self.chapter_number
+
+
+class Vocabulary(ChapterChildMixin, SearchKeysModel, BaseModel):
+    SEARCH_KEY_SOURCE = 'word'
 
-class Vocabulary(BaseModel):
     chapter = models.ForeignKey(
         Chapter,
         on_delete=models.CASCADE,
@@ -36,6 +125,24 @@ class Vocabulary(BaseModel):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            trigram_index('word', 'vocabulary_word_trgm'),
+            trigram_index('meaning', 'vocabulary_meaning_trgm'),
+            models.Index(
+                fields=['search_key'],
+                name='vocabulary_search_key_idx',
+                opclasses=['varchar_pattern_ops']
+            ),
+            models.Index(
+                fields=['search_romaji'],
+                name='vocabulary_romaji_idx',
+                opclasses=['varchar_pattern_ops']
+            ),
+            # Keyset pagination (common.pagination.KeysetPagination)
+            models.Index(fields=['created_at', 'id'], name='vocabulary_created_idx'),
+        ]
+
     def is_kanji(self):
         return len(self.word) == 1 and '\u4e00' <= self.word <= '\u9faf'
 
@@ -61,7 +168,22 @@ class KanjiInfo(BaseModel):
         return f"KanjiInfo for {self.vocabulary.word}"
 
 
-class GrammarPattern(models.Model):
+class GrammarPatternQuerySet(models.QuerySet):
+    def with_usages(self):
+        """
+        Prefetch usages and their examples, both in ``order``. Serializing
+        any number of patterns then costs two extra queries.
+        """
+        examples = GrammarExample.objects.order_by('order', 'id')
+        usages = GrammarUsage.objects.order_by('order', 'id').prefetch_related(
+            models.Prefetch('examples', queryset=examples)
+        )
+        return self.prefetch_related(models.Prefetch('usages', queryset=usages))
+
+
+class GrammarPattern(ChapterChildMixin, SearchKeysModel):
+    SEARCH_KEY_SOURCE = 'pattern'
+
     chapter = models.ForeignKey(
         'Chapter',
         on_delete=models.CASCADE,
@@ -72,6 +194,24 @@ class GrammarPattern(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = GrammarPatternQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            trigram_index('pattern', 'grammar_pattern_trgm'),
+            trigram_index('description', 'grammar_description_trgm'),
+            models.Index(
+                fields=['search_key'],
+                name='grammar_search_key_idx',
+                opclasses=['varchar_pattern_ops']
+            ),
+            models.Index(
+                fields=['search_romaji'],
+                name='grammar_romaji_idx',
+                opclasses=['varchar_pattern_ops']
+            ),
+        ]
+
     def __str__(self):
         return self.pattern
 
@@ -85,6 +225,11 @@ class GrammarUsage(BaseModel):
     explanation = models.TextField()  # e.g., Expresses ongoing action
     order = models.PositiveIntegerField(default=0)
 
+    class Meta:
+        indexes = [
+            trigram_index('explanation', 'grammar_explanation_trgm'),
+        ]
+
     def __str__(self):
         return f"Usage for {self.pattern.pattern} [{self.order}]"
 
@@ -108,5 +253,11 @@ class Note(BaseModel):
     title = models.CharField(max_length=200, blank=True, null=True)
     content = models.TextField()
 
+    class Meta:
+        indexes = [
+            trigram_index('title', 'note_title_trgm'),
+            trigram_index('content', 'note_content_trgm'),
+        ]
+
     def __str__(self):
         return self.title if self.title else self.content[:30]
@@ -0,0 +1,138 @@
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Q
+from django.db.models.functions import Greatest
+
+from common.japanese import search_keys
+from .models import Vocabulary, GrammarPattern, GrammarUsage, Note
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+def _rank(query, fields):
+    similarities = [TrigramWordSimilarity(query, field) for field in fields]
+    if len(similarities) == 1:
+        return similarities[0]
+    return Greatest(*similarities)
+
+
+def _contains(query, fields):
+    # icontains compiles to UPPER(col::text) LIKE UPPER(%q%), which is served
+    # by the UPPER(col) gin_trgm_ops indexes declared on the models.
+    condition = Q()
+    for field in fields:
+        condition |= Q(**{f'{field}__icontains': query})
+    return condition
+
+
+def normalized_match(query):
+    """
+    Prefix match on the precomputed search keys of SearchKeysModel rows, so
+    katakana, half-width and romaji queries find hiragana words. Served by
+    the varchar_pattern_ops indexes on search_key/search_romaji.
+    """
+    key, romaji = search_keys(query)
+    condition = Q()
+    if key:
+        condition |= Q(search_key__startswith=key)
+    if romaji:
+        condition |= Q(search_romaji__startswith=romaji)
+    return condition
+
+
+def _vocabulary_hits(query):
+    fields = ['word', 'meaning']
+    return (
+        Vocabulary.objects
+        .filter(_contains(query, fields) | normalized_match(query))
+        .annotate(rank=_rank(query, fields))
+        .values('id', 'chapter', 'word', 'meaning', 'example', 'rank')
+    )
+
+
+def _grammar_hits(query):
+    fields = ['pattern', 'description']
+    usage_match = GrammarUsage.objects.filter(
+        explanation__icontains=query
+    ).values('pattern_id')
+    return (
+        GrammarPattern.objects
+        .filter(
+            _contains(query, fields)
+            | normalized_match(query)
+            | Q(pk__in=usage_match)
+        )
+        .annotate(rank=_rank(query, fields))
+        .values('id', 'chapter', 'pattern', 'description', 'rank')
+    )
+
+
+def _note_hits(query):
+    fields = ['title', 'content']
+    return (
+        Note.objects
+        .filter(_contains(query, fields))
+        .annotate(rank=_rank(query, fields))
+        .values('id', 'title', 'content', 'rank')
+    )
+
+
+SEARCH_TYPES = {
+    'vocabulary': _vocabulary_hits,
+    'grammar': _grammar_hits,
+    'note': _note_hits,
+}
+
+
+def search_params(params):
+    """
+    Validate the ``q``, ``limit`` and ``types`` query params.
+    Returns ``(query, limit, types)``; raises ValueError with a message
+    for the client.
+    """
+    query = params.get('q', '').strip()
+
+    try:
+        limit = int(params.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    limit = min(max(limit, 1), MAX_LIMIT)
+
+    types = params.get('types')
+    if types:
+        types = [type_name.strip() for type_name in types.split(',')]
+        unknown = [name for name in types if name not in SEARCH_TYPES]
+        if unknown:
+            raise ValueError(f'Unknown search types: {", ".join(unknown)}')
+    return query, limit, types
+
+
+def _search_querysets(query, limit, types):
+    for type_name in types or SEARCH_TYPES:
+        yield type_name, SEARCH_TYPES[type_name](query).order_by('-rank', 'id')[:limit]
+
+
+def _merge(hits):
+    hits.sort(key=lambda hit: hit['rank'] or 0, reverse=True)
+    return hits
+
+
+def search_catalog(query, limit=DEFAULT_LIMIT, types=None):
+    """
+    Search vocabulary, grammar patterns and notes for ``query``.
+
+    Returns at most ``limit`` hits per type, each tagged with its ``type``,
+    merged and ordered by trigram word similarity (best first).
+    """
+    hits = []
+    for type_name, queryset in _search_querysets(query, limit, types):
+        hits.extend({'type': type_name, **hit} for hit in queryset)
+    return _merge(hits)
+
+
+async def asearch_catalog(query, limit=DEFAULT_LIMIT, types=None):
+    """search_catalog() on the async ORM."""
+    hits = []
+    for type_name, queryset in _search_querysets(query, limit, types):
+        hits.extend([{'type': type_name, **hit} async for hit in queryset])
+    return _merge(hits)
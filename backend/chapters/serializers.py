@@ -48,6 +48,31 @@ class ChapterSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+class ChapterSummarySerializer(serializers.ModelSerializer):
+    # Annotated by ChapterViewSet.get_queryset for the list action
+    vocabulary_count = serializers.IntegerField(read_only=True)
+    grammar_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Chapter
+        fields = [
+            'id', 'level', 'book_name', 'chapter_number',
+            'vocabulary_count', 'grammar_count', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
+class BookSerializer(serializers.Serializer):
+    # Rows of BookViewSet.get_queryset, grouped by book_name
+    book_name = serializers.CharField(read_only=True)
+    chapter_count = serializers.IntegerField(read_only=True)
+    lowest_level = serializers.CharField(read_only=True)
+    highest_level = serializers.CharField(read_only=True)
+    vocabulary_count = serializers.IntegerField(read_only=True)
+    grammar_count = serializers.IntegerField(read_only=True)
+    updated_at = serializers.DateTimeField(read_only=True)
+
+
 class NoteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Note
@@ -0,0 +1,136 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from common.cache import invalidate
+from .models import Chapter, GrammarExample, GrammarPattern, GrammarUsage, Vocabulary
+
+# A chapter's updated_at covers its whole nested tree (vocabularies, grammar
+# patterns, usages, examples), and a grammar pattern's covers its usages and
+# examples, so a single row is enough to validate a cached response (see
+# common.conditional). update() is used so touching fires no further signals.
+#
+# Rows deleted by the cascade of a parent's delete are skipped: the parent's
+# own receivers cover them, and per-row work would make deleting a chapter
+# cost queries in proportion to its tree.
+
+
+def touch_chapters(**filters):
+    Chapter.objects.filter(**filters).update(updated_at=timezone.now())
+
+
+def touch_patterns(**filters):
+    GrammarPattern.objects.filter(**filters).update(updated_at=timezone.now())
+
+
+def cascaded_from(origin, *models):
+    """Whether ``origin``, the instance or queryset a delete started from, is one of ``models``."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+def chapter_ids(instance):
+    """The chapter of ``instance`` and, after a move, the one it left."""
+    return {instance.chapter_id, getattr(instance, 'loaded_chapter_id', None)} - {None}
+
+
+@receiver(post_save, sender=Vocabulary)
+@receiver(post_delete, sender=Vocabulary)
+@receiver(post_save, sender=GrammarPattern)
+@receiver(post_delete, sender=GrammarPattern)
+def touch_chapter(sender, instance, origin=None, **kwargs):
+    if not cascaded_from(origin, Chapter):
+        touch_chapters(pk__in=chapter_ids(instance))
+
+
+@receiver(post_save, sender=GrammarUsage)
+@receiver(post_delete, sender=GrammarUsage)
+def touch_usage_parents(sender, instance, origin=None, **kwargs):
+    if cascaded_from(origin, Chapter, GrammarPattern):
+        return
+    touch_patterns(pk=instance.pattern_id)
+    touch_chapters(grammar_patterns=instance.pattern_id)
+
+
+@receiver(post_save, sender=GrammarExample)
+@receiver(post_delete, sender=GrammarExample)
+def touch_example_parents(sender, instance, origin=None, **kwargs):
+    if cascaded_from(origin, Chapter, GrammarPattern, GrammarUsage):
+        return
+    touch_patterns(usages=instance.usage_id)
+    touch_chapters(grammar_patterns__usages=instance.usage_id)
+
+
+# Response cache namespaces (common.cache): a list namespace per viewset and
+# one per object for detail responses. Chapter lists show vocabulary and
+# grammar counts and chapter details nest the whole tree, so child writes
+# also drop the chapter entries.
+
+def _pattern_chapter(pattern_id):
+    return GrammarPattern.objects.filter(pk=pattern_id).values_list('chapter_id', flat=True).first()
+
+
+@receiver(post_save, sender=Chapter)
+@receiver(post_delete, sender=Chapter)
+def invalidate_chapter(sender, instance, **kwargs):
+    # Vocabulary and grammar lists can be filtered by chapter fields
+    invalidate('chapters', f'chapters:{instance.pk}', 'vocabularies', 'grammar_patterns')
+
+
+@receiver(pre_delete, sender=Chapter)
+def invalidate_chapter_children(sender, instance, **kwargs):
+    # Detail responses of the rows the cascade is about to delete; their
+    # own receivers skip cascades
+    invalidate(
+        *(f'vocabularies:{pk}' for pk in instance.vocabularies.values_list('pk', flat=True)),
+        *(f'grammar_patterns:{pk}' for pk in instance.grammar_patterns.values_list('pk', flat=True))
+    )
+
+
+@receiver(post_save, sender=Vocabulary)
+@receiver(post_delete, sender=Vocabulary)
+def invalidate_vocabulary(sender, instance, origin=None, **kwargs):
+    if cascaded_from(origin, Chapter):
+        return
+    invalidate(
+        'vocabularies', f'vocabularies:{instance.pk}',
+        'chapters', *(f'chapters:{pk}' for pk in chapter_ids(instance))
+    )
+
+
+@receiver(post_save, sender=GrammarPattern)
+@receiver(post_delete, sender=GrammarPattern)
+def invalidate_grammar_pattern(sender, instance, origin=None, **kwargs):
+    if cascaded_from(origin, Chapter):
+        return
+    invalidate(
+        'grammar_patterns', f'grammar_patterns:{instance.pk}',
+        'chapters', *(f'chapters:{pk}' for pk in chapter_ids(instance))
+    )
+
+
+@receiver(post_save, sender=GrammarUsage)
+@receiver(post_delete, sender=GrammarUsage)
+def invalidate_grammar_usage(sender, instance, origin=None, **kwargs):
+    if cascaded_from(origin, Chapter, GrammarPattern):
+        return
+    invalidate(
+        'grammar_patterns', f'grammar_patterns:{instance.pattern_id}',
+        f'chapters:{_pattern_chapter(instance.pattern_id)}'
+    )
+
+
+@receiver(post_save, sender=GrammarExample)
+@receiver(post_delete, sender=GrammarExample)
+def invalidate_grammar_example(sender, instance, origin=None, **kwargs):
+    if cascaded_from(origin, Chapter, GrammarPattern, GrammarUsage):
+        return
+    pattern_id = (
+        GrammarUsage.objects.filter(pk=instance.usage_id)
+        .values_list('pattern_id', flat=True).first()
+    )
+    invalidate(
+        'grammar_patterns', f'grammar_patterns:{pattern_id}',
+        f'chapters:{_pattern_chapter(pattern_id)}'
+    )
@@ -1,19 +1,56 @@
-from rest_framework import viewsets, filters
+from rest_framework import filters, mixins, status, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from django.db.models import Count, IntegerField, Max, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.permissions import AllowAny
 
 from .models import Chapter, Vocabulary, GrammarPattern, Note
+from common import constant
+from common.cache import ResponseCacheMixin
+from common.conditional import ConditionalGetMixin
+from common.pagination import SelectablePaginationMixin
+from .decks import build_deck, deck_params
+from .filters import NormalizedSearchFilter
+from .importers import ImportFileError, import_vocabulary_file
+from .search import search_catalog, search_params
 from .serializers import (
+    BookSerializer,
     ChapterSerializer,
+    ChapterSummarySerializer,
     VocabularySerializer,
     GrammarPatternSerializer,
     NoteSerializer
 )
 
 
-class ChapterViewSet(viewsets.ModelViewSet):
+def _child_count(model):
+    """Correlated COUNT(*) of ``model`` rows belonging to the outer chapter."""
+    counts = (
+        model.objects
+        .filter(chapter=OuterRef('pk'))
+        .order_by()
+        .values('chapter')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class ChapterViewSet(ResponseCacheMixin, ConditionalGetMixin, viewsets.ModelViewSet):
+    """
+    The list action returns chapter fields plus vocabulary/grammar counts,
+    computed in the same SELECT. The nested tree is only serialized for
+    single chapters and is loaded with a fixed number of prefetch queries.
+
+    Child writes touch the chapter's updated_at, so the validators of both
+    actions only need the chapter rows.
+    """
     queryset = Chapter.objects.all()
     serializer_class = ChapterSerializer
+    cache_namespace = 'chapters'
     permission_classes = [AllowAny]  # Allow all operations
     filter_backends = [
         DjangoFilterBackend,
@@ -21,37 +58,156 @@ class ChapterViewSet(viewsets.ModelViewSet):
         filters.OrderingFilter
     ]
     filterset_fields = ['level', 'book_name']
-    search_fields = ['title', 'description']
-    ordering_fields = ['order', 'created_at']
+    search_fields = ['book_name']
+    # book_name, chapter_number is served by the unique index on the pair
+    ordering_fields = ['level', 'book_name', 'chapter_number', 'created_at', 'updated_at']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            return queryset.annotate(
+                vocabulary_count=_child_count(Vocabulary),
+                grammar_count=_child_count(GrammarPattern),
+            )
+        return queryset.with_tree()
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ChapterSummarySerializer
+        return super().get_serializer_class()
+
+    def get_validator_queryset(self):
+        return Chapter.objects.all()
+
 
+class BookViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet
+):
+    """
+    Books (distinct Chapter.book_name) with their chapter count, level range
+    and vocabulary/grammar totals, from one query grouped by book_name.
+    The list is not paginated; there are few books.
 
-class VocabularyViewSet(viewsets.ModelViewSet):
+    The totals change with chapter, vocabulary and grammar writes, which all
+    touch the chapters and invalidate the 'chapters' cache namespace, so the
+    chapter rows are enough for the validators.
+    """
+    queryset = Chapter.objects.all()
+    serializer_class = BookSerializer
+    cache_namespace = 'chapters'
+    permission_classes = [AllowAny]
+    pagination_class = None
+    lookup_field = 'book_name'
+    lookup_value_regex = '[^/]+'
+
+    def get_queryset(self):
+        return (
+            super().get_queryset()
+            .order_by()
+            .values('book_name')
+            .annotate(
+                chapter_count=Count('pk'),
+                # N5 is the lowest JLPT level and sorts last
+                lowest_level=Max('level'),
+                highest_level=Min('level'),
+                vocabulary_count=Sum(_child_count(Vocabulary)),
+                grammar_count=Sum(_child_count(GrammarPattern)),
+                updated_at=Max('updated_at'),
+            )
+            .order_by('book_name')
+        )
+
+    def get_validator_queryset(self):
+        return Chapter.objects.all()
+
+    def get_cache_namespaces(self):
+        # No per-book namespace; chapter writes only know the chapter pk
+        return [self.cache_namespace]
+
+
+class VocabularyViewSet(ResponseCacheMixin, ConditionalGetMixin, SelectablePaginationMixin, viewsets.ModelViewSet):
     queryset = Vocabulary.objects.all()
+    cursor_ordering = ('created_at', 'id')
+    cache_namespace = 'vocabularies'
     serializer_class = VocabularySerializer
     permission_classes = [AllowAny]  # Allow all operations
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
+        NormalizedSearchFilter,
         filters.OrderingFilter
     ]
     filterset_fields = ['chapter', 'chapter__level']
     search_fields = ['word', 'meaning']
     ordering_fields = ['word', 'created_at']
 
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='import',
+        parser_classes=[MultiPartParser]
+    )
+    def import_file(self, request):
+        """
+        Upload an .xlsx (one chapter per sheet) or .csv file of vocabulary.
+        Rows are streamed and bulk-inserted in one transaction; the response
+        is a per-sheet report of created and failed rows.
+        """
+        upload = request.FILES.get('file')
+        book_name = request.data.get('book_name')
+        level = request.data.get('level', 'N5')
+        chapter_number = request.data.get('chapter_number')
 
-class GrammarPatternViewSet(viewsets.ModelViewSet):
+        if not upload or not book_name:
+            return Response(
+                {'error': 'Missing required fields: file or book_name'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if level not in dict(constant.LEVEL_CHOICES):
+            return Response(
+                {'error': f'Invalid level: {level}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            chapter_number = int(chapter_number) if chapter_number else None
+        except ValueError:
+            return Response(
+                {'error': 'chapter_number must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            report = import_vocabulary_file(
+                upload, book_name, level, chapter_number=chapter_number
+            )
+        except ImportFileError as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(report, status=status.HTTP_201_CREATED)
+
+
+class GrammarPatternViewSet(ResponseCacheMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = GrammarPattern.objects.all()
     serializer_class = GrammarPatternSerializer
+    cache_namespace = 'grammar_patterns'
     permission_classes = [AllowAny]  # Allow all operations
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
+        NormalizedSearchFilter,
         filters.OrderingFilter
     ]
     filterset_fields = ['chapter', 'chapter__level']
     search_fields = ['pattern', 'description', 'usages__explanation']
     ordering_fields = ['pattern', 'created_at']
 
+    def get_queryset(self):
+        return super().get_queryset().with_usages()
+
     def perform_create(self, serializer):
         chapter_id = self.request.data.get('chapter')
         if chapter_id:
@@ -70,4 +226,44 @@ class NoteViewSet(viewsets.ModelViewSet):
         filters.OrderingFilter
     ]
     search_fields = ['title', 'content']
-    ordering_fields = ['created_at', 'updated_at'] 
\ No newline at end of file
+    ordering_fields = ['created_at', 'updated_at']
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def search(request):
+    """
+    Global search over vocabulary, grammar and notes in one request.
+
+    Query params: ``q`` (required), ``limit`` per type (default 10, max 50)
+    and ``types``, a comma separated subset of vocabulary,grammar,note.
+    """
+    try:
+        query, limit, types = search_params(request.query_params)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    if not query:
+        return Response({'query': query, 'results': []})
+
+    return Response({
+        'query': query,
+        'results': search_catalog(query, limit=limit, types=types),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def decks(request):
+    """
+    Full flashcard deck across several chapters in one response.
+
+    Query params: ``chapters`` (comma separated ids), ``type`` (vocabulary or
+    grammar), optional ``sample`` (keep N random cards) and ``seed`` (makes
+    the shuffle reproducible; the seed used is returned either way).
+    """
+    try:
+        chapter_ids, card_type, sample, seed = deck_params(request.query_params)
+    except ValueError as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(build_deck(chapter_ids, card_type, sample=sample, seed=seed))
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
 
 
 class CommonConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'common'
+
+    def ready(self):
+        from .middleware import install_query_timer
+        connection_created.connect(install_query_timer, dispatch_uid='common.install_query_timer')
+
+        if settings.DATABASES['default']['ENGINE'] == 'common.backends.postgresql':
+            from .backends.postgresql.base import count_reuse
+            request_started.connect(count_reuse, dispatch_uid='common.count_reuse')
@@ -0,0 +1,79 @@
+import threading
+import time
+
+from django.db.backends.postgresql import base
+
+
+class ConnectionStats:
+    """
+    Connection counters of this process: how many server connections are
+    open, how many were opened and closed, the time spent waiting for new
+    ones, and how often a request found a persistent connection to reuse.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+        self.opened = 0
+        self.closed = 0
+        self.connect_seconds = 0.0
+        self.connect_seconds_max = 0.0
+        self.requests = 0
+        self.reused = 0
+
+    def connected(self, seconds):
+        with self._lock:
+            self.open += 1
+            self.opened += 1
+            self.connect_seconds += seconds
+            self.connect_seconds_max = max(self.connect_seconds_max, seconds)
+
+    def disconnected(self):
+        with self._lock:
+            self.open -= 1
+            self.closed += 1
+
+    def request_started(self, reused):
+        with self._lock:
+            self.requests += 1
+            self.reused += reused
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'open': self.open,
+                'opened': self.opened,
+                'closed': self.closed,
+                'connect_wait_avg_ms': (
+                    self.connect_seconds / self.opened * 1000 if self.opened else None
+                ),
+                'connect_wait_max_ms': self.connect_seconds_max * 1000,
+                'requests': self.requests,
+                'reuse_ratio': self.reused / self.requests if self.requests else None,
+            }
+
+
+stats = ConnectionStats()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """The postgresql backend, counting connects and closes into ``stats``."""
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        stats.connected(time.perf_counter() - start)
+
+    def _close(self):
+        if self.connection is not None:
+            stats.disconnected()
+        super()._close()
+
+
+def count_reuse(sender, **kwargs):
+    """request_started receiver: did the request find an open connection?"""
+    from django.db import connections
+
+    connection = connections['default']
+    if isinstance(connection, DatabaseWrapper):
+        stats.request_started(connection.connection is not None)
@@ -0,0 +1,37 @@
+from django.db import connection, transaction
+from django.db.models import Max, Min
+
+
+def id_ranges(model, batch_size):
+    """
+    Half-open ``(start, end)`` primary key ranges of at most ``batch_size``
+    ids covering every row of ``model``. Gaps only make batches smaller.
+    """
+    bounds = model.objects.aggregate(first=Min('pk'), last=Max('pk'))
+    if bounds['first'] is None:
+        return []
+    return [
+        (start, min(start + batch_size, bounds['last'] + 1))
+        for start in range(bounds['first'], bounds['last'] + 1, batch_size)
+    ]
+
+
+def update_in_batches(model, sql, params, batch_size, stdout=None):
+    """
+    Run the UPDATE ``sql`` once per id range of ``model`` and return the
+    number of rows changed. ``sql`` must end with a condition taking the
+    range as two more params (``id >= %s AND id < %s``).
+
+    Each batch commits on its own, so row locks are held for one batch only
+    and an interrupted run keeps what it has done; the statements must be
+    idempotent.
+    """
+    ranges = id_ranges(model, batch_size)
+    updated = 0
+    for number, (start, end) in enumerate(ranges, 1):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [*params, start, end])
+            updated += cursor.rowcount
+        if stdout is not None:
+            stdout.write(f'  batch {number}/{len(ranges)} (ids {start}-{end - 1}): {updated} updated so far')
+    return updated
@@ -0,0 +1,154 @@
+import hashlib
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+KEY_PREFIX = 'response'
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+class CacheStats:
+    """Hit/miss counters of this process, see cache_stats()."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def as_dict(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_ratio': self.hits / lookups if lookups else None,
+            }
+
+
+stats = CacheStats()
+
+
+def _generation_key(namespace):
+    return f'{KEY_PREFIX}:generation:{namespace}'
+
+
+def invalidate(*namespaces):
+    """
+    Drop every cached response that depends on one of ``namespaces``.
+
+    Cached keys embed the current generation token of their namespaces, so
+    giving a namespace a new token orphans all of them at once. This needs
+    no key scan and works on any cache backend. The tokens are random, not
+    counters, so concurrent invalidations can never produce the same one.
+    The swap waits for the transaction to commit. Otherwise a concurrent
+    read could cache the old rows under the new token.
+    """
+    def swap():
+        _cache().set_many(
+            {_generation_key(namespace): uuid.uuid4().hex for namespace in namespaces},
+            timeout=None
+        )
+        stats.count('invalidations')
+
+    transaction.on_commit(swap)
+
+
+def cache_stats():
+    return stats.as_dict()
+
+
+class ResponseCacheMixin:
+    """
+    Read-through cache for ``list`` and ``retrieve``.
+
+    Responses are keyed by URL, normalized query parameters and format, plus
+    the generation tokens of the namespaces returned by
+    get_cache_namespaces(). Signal receivers call invalidate() with the
+    namespaces a write touches (see chapters.signals).
+
+    Only the serialized data and the validator headers are stored, so a hit
+    costs no query. A conditional request that matches the stored ETag gets
+    a 304 straight from the cache.
+    """
+    cache_namespace = None
+
+    def get_cache_namespaces(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            return [f'{self.cache_namespace}:{self.kwargs[lookup_url_kwarg]}']
+        return [self.cache_namespace]
+
+    def get_cache_key(self, request, namespaces):
+        cache = _cache()
+        generation_keys = [_generation_key(namespace) for namespace in namespaces]
+        generations = cache.get_many(generation_keys)
+        missing = {key: uuid.uuid4().hex for key in generation_keys if key not in generations}
+        if missing:
+            # add() keeps a token another process set in the meantime
+            for key, token in missing.items():
+                if not cache.add(key, token, timeout=None):
+                    token = cache.get(key, token)
+                generations[key] = token
+
+        params = sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            for value in values
+        )
+        source = repr((
+            request.build_absolute_uri(request.path),
+            params,
+            request.accepted_renderer.format,
+            [generations[key] for key in generation_keys],
+        ))
+        return f'{KEY_PREFIX}:{hashlib.md5(source.encode()).hexdigest()}'
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        cache = _cache()
+        key = self.get_cache_key(request, self.get_cache_namespaces())
+        entry = cache.get(key)
+        if entry is not None:
+            stats.count('hits')
+            data, headers = entry
+            response = get_conditional_response(
+                request,
+                etag=headers.get('ETag'),
+                response=Response(data, headers=headers)
+            )
+            response['X-Cache'] = 'HIT'
+            return response
+
+        stats.count('misses')
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and isinstance(response, Response):
+            headers = {
+                name: response[name] for name in CACHED_HEADERS if name in response
+            }
+            cache.set(key, (response.data, headers), _timeout())
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
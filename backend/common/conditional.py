@@ -0,0 +1,100 @@
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def validators(request, format, count, last_modified):
+    """
+    ``(etag, last_modified timestamp)`` of a response built from ``count``
+    rows last changed at ``last_modified``. Shared with the async views so
+    both stacks hand out the same validators.
+    """
+    # Filters, page and format are part of the representation
+    source = '|'.join([
+        request.get_full_path(),
+        format,
+        str(count),
+        last_modified.isoformat() if last_modified else '',
+    ])
+    etag = quote_etag(hashlib.md5(source.encode()).hexdigest())
+    return etag, last_modified and last_modified.timestamp()
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    # Let clients keep a copy but revalidate it on every use
+    patch_cache_control(response, no_cache=True)
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validators for ``list`` and ``retrieve``.
+
+    The validators come from one aggregate query, ``COUNT(*)`` and
+    ``MAX(updated_at)`` over the rows the response is built from (the count
+    catches deletes). List responses, and details built from several rows
+    such as a book, carry only the ETag: a delete does not move
+    ``MAX(updated_at)``. When the client's copy is current the view answers
+    304 before loading or serializing anything.
+
+    Nested data must bump its parent's ``updated_at`` to be noticed, see
+    chapters.signals.
+    """
+    validator_field = 'updated_at'
+
+    def get_validator_queryset(self):
+        """
+        Rows that decide the validators. Override when get_queryset() adds
+        annotations or prefetches that the aggregate does not need.
+        """
+        return self.get_queryset()
+
+    def get_validators(self, request):
+        queryset = self.get_validator_queryset()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        detail = lookup_url_kwarg in self.kwargs
+        if detail:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        else:
+            queryset = self.filter_queryset(queryset)
+
+        state = queryset.order_by().aggregate(
+            count=Count('pk'), last_modified=Max(self.validator_field)
+        )
+        etag, last_modified = validators(
+            request, request.accepted_renderer.format,
+            state['count'], state['last_modified']
+        )
+        if not detail or state['count'] > 1:
+            # Deleting any row but the newest leaves MAX(updated_at) as it
+            # was; only the ETag (which has the count) notices
+            last_modified = None
+        return etag, last_modified
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        try:
+            etag, last_modified = self.get_validators(request)
+        except (TypeError, ValueError, ValidationError):
+            # Malformed lookup value; the handler answers 404
+            return handler(request, *args, **kwargs)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            set_validators(response, etag, last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,120 @@
+import re
+import unicodedata
+
+# Context annotations such as "（しけんに～）" are not part of the word itself
+ANNOTATION_RE = re.compile(r'\([^)]*\)')
+WHITESPACE_RE = re.compile(r'\s+')
+
+KATAKANA_START = ord('ァ')
+KATAKANA_END = ord('ヶ')
+KANA_OFFSET = ord('ァ') - ord('ぁ')
+
+LONG_VOWEL_MARK = 'ー'
+SMALL_TSU = 'っ'
+
+ROMAJI = {
+    'あ': 'a', 'い': 'i', 'う': 'u', 'え': 'e', 'お': 'o',
+    'か': 'ka', 'き': 'ki', 'く': 'ku', 'け': 'ke', 'こ': 'ko',
+    'が': 'ga', 'ぎ': 'gi', 'ぐ': 'gu', 'げ': 'ge', 'ご': 'go',
+    'さ': 'sa', 'し': 'shi', 'す': 'su', 'せ': 'se', 'そ': 'so',
+    'ざ': 'za', 'じ': 'ji', 'ず': 'zu', 'ぜ': 'ze', 'ぞ': 'zo',
+    'た': 'ta', 'ち': 'chi', 'つ': 'tsu', 'て': 'te', 'と': 'to',
+    'だ': 'da', 'ぢ': 'ji', 'づ': 'zu', 'で': 'de', 'ど': 'do',
+    'な': 'na', 'に': 'ni', 'ぬ': 'nu', 'ね': 'ne', 'の': 'no',
+    'は': 'ha', 'ひ': 'hi', 'ふ': 'fu', 'へ': 'he', 'ほ': 'ho',
+    'ば': 'ba', 'び': 'bi', 'ぶ': 'bu', 'べ': 'be', 'ぼ': 'bo',
+    'ぱ': 'pa', 'ぴ': 'pi', 'ぷ': 'pu', 'ぺ': 'pe', 'ぽ': 'po',
+    'ま': 'ma', 'み': 'mi', 'む': 'mu', 'め': 'me', 'も': 'mo',
+    'や': 'ya', 'ゆ': 'yu', 'よ': 'yo',
+    'ら': 'ra', 'り': 'ri', 'る': 'ru', 'れ': 're', 'ろ': 'ro',
+    'わ': 'wa', 'ゐ': 'i', 'ゑ': 'e', 'を': 'o', 'ん': 'n', 'ゔ': 'vu',
+    'ぁ': 'a', 'ぃ': 'i', 'ぅ': 'u', 'ぇ': 'e', 'ぉ': 'o',
+    'ゃ': 'ya', 'ゅ': 'yu', 'ょ': 'yo', 'ゎ': 'wa',
+}
+
+# Two-kana combinations (きゃ, しゅ, ちょ, ふぁ, ...)
+DIGRAPH_ROMAJI = {
+    'しゃ': 'sha', 'しゅ': 'shu', 'しぇ': 'she', 'しょ': 'sho',
+    'じゃ': 'ja', 'じゅ': 'ju', 'じぇ': 'je', 'じょ': 'jo',
+    'ちゃ': 'cha', 'ちゅ': 'chu', 'ちぇ': 'che', 'ちょ': 'cho',
+    'ぢゃ': 'ja', 'ぢゅ': 'ju', 'ぢょ': 'jo',
+    'ふぁ': 'fa', 'ふぃ': 'fi', 'ふぇ': 'fe', 'ふぉ': 'fo',
+    'てぃ': 'ti', 'でぃ': 'di', 'とぅ': 'tu', 'どぅ': 'du',
+    'うぃ': 'wi', 'うぇ': 'we', 'うぉ': 'wo',
+    'ゔぁ': 'va', 'ゔぃ': 'vi', 'ゔぇ': 've', 'ゔぉ': 'vo',
+}
+for _kana in 'きぎにひびぴみり':
+    _consonant = ROMAJI[_kana][:-1]
+    for _small, _vowel in (('ゃ', 'a'), ('ゅ', 'u'), ('ょ', 'o')):
+        DIGRAPH_ROMAJI[_kana + _small] = f'{_consonant}y{_vowel}'
+
+
+def katakana_to_hiragana(text):
+    return ''.join(
+        chr(ord(char) - KANA_OFFSET)
+        if KATAKANA_START <= ord(char) <= KATAKANA_END else char
+        for char in text
+    )
+
+
+def _is_punctuation(char):
+    if char == LONG_VOWEL_MARK:
+        return False
+    return unicodedata.category(char)[0] in ('P', 'S')
+
+
+def normalize(text):
+    """
+    Fold text into a search key: NFKC (full/half-width folding), lower case,
+    katakana -> hiragana, parenthesized annotations and punctuation removed,
+    whitespace collapsed.
+
+    >>> normalize('しっぱいします（しけんに～） 失敗します（試験に～）')
+    'しっぱいします 失敗します'
+    >>> normalize('ｶﾀｶﾅ')
+    'かたかな'
+    """
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    text = ANNOTATION_RE.sub(' ', text)
+    text = katakana_to_hiragana(text)
+    text = ''.join(' ' if _is_punctuation(char) else char for char in text)
+    return WHITESPACE_RE.sub(' ', text).strip()
+
+
+def to_romaji(text):
+    """
+    Hepburn romanization of the kana in ``text``; other characters (kanji,
+    latin) are passed through unchanged. Expects hiragana, see normalize().
+    """
+    result = []
+    index = 0
+    double_next = False
+    while index < len(text):
+        pair = text[index:index + 2]
+        char = text[index]
+        if pair in DIGRAPH_ROMAJI:
+            syllable = DIGRAPH_ROMAJI[pair]
+            index += 2
+        elif char == SMALL_TSU:
+            double_next = True
+            index += 1
+            continue
+        elif char == LONG_VOWEL_MARK:
+            # ラーメン -> raamen: repeat the previous vowel
+            syllable = result[-1][-1] if result and result[-1][-1] in 'aeiou' else ''
+            index += 1
+        else:
+            syllable = ROMAJI.get(char, char)
+            index += 1
+
+        if double_next and syllable and syllable[0] not in 'aeioun':
+            syllable = ('t' if syllable.startswith('ch') else syllable[0]) + syllable
+        double_next = False
+        result.append(syllable)
+    return ''.join(result)
+
+
+def search_keys(text):
+    """Return ``(key, romaji)`` for storing or querying ``text``."""
+    key = normalize(text)
+    return key, to_romaji(key).replace(' ', '')
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.utils import OperationalError
+
+
+class Command(BaseCommand):
+    """Django command to pause execution until database is available"""
+
+    help = 'Waits until the database accepts connections and answers a query'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument(
+            '--timeout', type=float, default=60,
+            help='Give up after this many seconds (default 60)'
+        )
+        parser.add_argument(
+            '--max-delay', type=float, default=5,
+            help='Longest pause between attempts in seconds (default 5)'
+        )
+
+    def probe(self, connection):
+        # connections[...] is only a handle; this actually connects
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+
+    def handle(self, *args, **options):
+        self.stdout.write('Waiting for database...')
+        connection = connections[options['database']]
+        deadline = time.monotonic() + options['timeout']
+        delay = 0.1
+        attempt = 1
+
+        while True:
+            try:
+                self.probe(connection)
+                break
+            except OperationalError as exc:
+                # Drop the failed connection so the next attempt starts fresh
+                connection.close()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(
+                        f'Database unavailable after {attempt} attempts: {exc}'
+                    )
+                delay = min(delay, remaining)
+                self.stdout.write(
+                    f'Database unavailable (attempt {attempt}), '
+                    f'retrying in {delay:.1f}s...'
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, options['max_delay'])
+                attempt += 1
+
+        self.stdout.write(self.style.SUCCESS('Database available!'))
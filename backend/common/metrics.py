@@ -0,0 +1,143 @@
+"""
+In-process request metrics in the Prometheus text format (see
+common.middleware.MetricsMiddleware and the /metrics view).
+
+Every worker process keeps its own numbers, like prometheus_client without
+multiprocess mode; scrape each worker, or sum the series per instance.
+"""
+import threading
+from bisect import bisect_left
+
+from common.backends.postgresql.base import stats as connection_stats
+from common.cache import stats as cache_stats
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last one is +Inf
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            cumulative += count
+            yield f'{name}_bucket', {**labels, 'le': str(bound)}, cumulative
+        yield f'{name}_sum', labels, self.sum
+        yield f'{name}_count', labels, cumulative
+
+
+class EndpointMetrics:
+    """Per ``(view, method)`` series, updated under one lock per request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._requests = {}
+
+    def record(self, view, method, status, seconds, queries, db_seconds, size):
+        key = (view, method)
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = {
+                    'duration': Histogram(DURATION_BUCKETS),
+                    'queries': Histogram(QUERY_BUCKETS),
+                    'db_seconds': 0.0,
+                    'response_bytes': 0,
+                }
+            endpoint['duration'].observe(seconds)
+            endpoint['queries'].observe(queries)
+            endpoint['db_seconds'] += db_seconds
+            endpoint['response_bytes'] += size
+            request_key = (view, method, f'{status // 100}xx')
+            self._requests[request_key] = self._requests.get(request_key, 0) + 1
+
+    def render(self):
+        with self._lock:
+            endpoints = {
+                key: {
+                    'duration': _copy(value['duration']),
+                    'queries': _copy(value['queries']),
+                    'db_seconds': value['db_seconds'],
+                    'response_bytes': value['response_bytes'],
+                }
+                for key, value in self._endpoints.items()
+            }
+            requests = dict(self._requests)
+
+        families = [
+            ('http_requests_total', 'counter', 'Requests by view, method and status class',
+             [('http_requests_total', {'view': v, 'method': m, 'status': s}, n)
+              for (v, m, s), n in requests.items()]),
+            ('http_request_duration_seconds', 'histogram', 'Request latency',
+             _histogram_samples(endpoints, 'duration', 'http_request_duration_seconds')),
+            ('http_request_db_queries', 'histogram', 'Database queries per request',
+             _histogram_samples(endpoints, 'queries', 'http_request_db_queries')),
+            ('http_request_db_seconds_total', 'counter', 'Time spent in database queries',
+             _counter_samples(endpoints, 'db_seconds', 'http_request_db_seconds_total')),
+            ('http_response_size_bytes_total', 'counter', 'Response body bytes',
+             _counter_samples(endpoints, 'response_bytes', 'http_response_size_bytes_total')),
+        ]
+
+        cache = cache_stats.as_dict()
+        connections = connection_stats.as_dict()
+        for name, metric_type, help_text, value in (
+            ('response_cache_hits_total', 'counter', 'Response cache hits', cache['hits']),
+            ('response_cache_misses_total', 'counter', 'Response cache misses', cache['misses']),
+            ('db_connections_open', 'gauge', 'Open database connections of this process',
+             connections['open']),
+            ('db_connections_opened_total', 'counter', 'Database connections opened',
+             connections['opened']),
+        ):
+            families.append((name, metric_type, help_text, [(name, {}, value)]))
+        return _format(families)
+
+
+def _copy(histogram):
+    copy = Histogram(histogram.buckets)
+    copy.counts = list(histogram.counts)
+    copy.sum = histogram.sum
+    return copy
+
+
+def _labels(key):
+    view, method = key
+    return {'view': view, 'method': method}
+
+
+def _histogram_samples(endpoints, field, name):
+    return [
+        sample
+        for key, value in endpoints.items()
+        for sample in value[field].samples(name, _labels(key))
+    ]
+
+
+def _counter_samples(endpoints, field, name):
+    return [(name, _labels(key), value[field]) for key, value in endpoints.items()]
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format(families):
+    lines = []
+    for name, metric_type, help_text, samples in families:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        for sample_name, labels, value in samples:
+            label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            lines.append(f'{sample_name}{{{label_text}}} {value}' if label_text else f'{sample_name} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+metrics = EndpointMetrics()
@@ -0,0 +1,87 @@
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from .metrics import metrics
+
+# The timer of the request being handled. A context variable rather than a
+# per-connection wrapper, because async views run their queries through
+# sync_to_async on another thread's connection; the context follows them.
+current_timer = ContextVar('query_timer', default=None)
+
+
+class QueryTimer:
+    """Counts the queries of one request and their time."""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+def time_queries(execute, sql, params, many, context):
+    timer = current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.seconds += time.perf_counter() - start
+        timer.queries += 1
+
+
+def install_query_timer(sender, connection, **kwargs):
+    """connection_created receiver adding time_queries to every connection."""
+    if time_queries not in connection.execute_wrappers:
+        # First, so connection.execute_wrapper() blocks still pop their own
+        connection.execute_wrappers.insert(0, time_queries)
+
+
+class MetricsMiddleware:
+    """
+    Records latency, query count, DB time and response size per resolved
+    view name and method into common.metrics (served at /metrics). Works on
+    both the WSGI and the ASGI stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        token = current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        token = current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    def record(self, request, response, seconds, timer):
+        match = request.resolver_match
+        # Unmatched paths share one series to keep the label set bounded
+        view = match.view_name if match else '<unresolved>'
+        size = 0 if response.streaming else len(response.content)
+        metrics.record(
+            view, request.method, response.status_code,
+            seconds, timer.queries, timer.seconds, size
+        )
@@ -0,0 +1,56 @@
+from rest_framework import pagination
+
+MAX_PAGE_SIZE = 1000
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """The default pagination; clients may ask for up to MAX_PAGE_SIZE rows."""
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+
+
+class KeysetPagination(pagination.CursorPagination):
+    """
+    Cursor pagination ordered by ``(created_at, id)``, with no COUNT(*).
+    DRF's cursor holds only the ``created_at`` of the page boundary, plus an
+    offset over the rows that share it. A page therefore scans from the
+    boundary instead of from the first row. ``id`` keeps the order stable
+    but is not part of the cursor, so a run of equal timestamps is still
+    stepped through by OFFSET.
+
+    The view's ``cursor_ordering`` (default newest first) replaces any
+    ``?ordering=``, since a cursor is only valid for one fixed order.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        return getattr(view, 'cursor_ordering', self.ordering)
+
+
+class SelectablePaginationMixin:
+    """
+    Lets a viewset be paged by page number or by cursor.
+
+    ``pagination_style`` picks the default per viewset; clients override it
+    with ``?pagination=cursor`` or ``?pagination=page``. The ``next`` and
+    ``previous`` links keep the parameter, so walking them stays in one style.
+    """
+    pagination_style = 'page'
+    pagination_classes = {
+        'page': PageNumberPagination,
+        'cursor': KeysetPagination,
+    }
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            default = 'cursor' if 'cursor' in params else self.pagination_style
+            style = params.get('pagination', default)
+            pagination_class = self.pagination_classes.get(
+                style, self.pagination_classes[self.pagination_style]
+            )
+            self._paginator = pagination_class()
+        return self._paginator
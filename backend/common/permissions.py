@@ -0,0 +1,11 @@
+from django.conf import settings
+from rest_framework.permissions import BasePermission
+
+
+class IsInternal(BasePermission):
+    """Staff users, or requests from ``settings.INTERNAL_IPS``."""
+
+    def has_permission(self, request, view):
+        if request.user and request.user.is_staff:
+            return True
+        return request.META.get('REMOTE_ADDR') in settings.INTERNAL_IPS
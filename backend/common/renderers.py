@@ -0,0 +1,66 @@
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib json module is used instead
+    orjson = None
+
+if orjson is not None:
+    # Datetimes go through DRF's encoder so they keep its "Z" suffix format
+    ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer on orjson: unescaped unicode, compact separators, and
+    datetimes, Decimals, UUIDs and lazy strings encoded by DRF's
+    JSONEncoder. U+2028/U+2029 are escaped as DRF does, and data orjson
+    cannot encode (e.g. integers above 64 bits) goes through DRF's renderer.
+
+    The output decodes to the same data as DRF's but is not byte-identical:
+    some floats are spelled differently (``1e16`` for ``1e+16``), and NaN
+    and infinities render as ``null`` where DRF's strict mode raises.
+    Falls back to the stdlib renderer when orjson is not installed or an
+    indented response is requested.
+    """
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        try:
+            ret = orjson.dumps(data, default=self.encoder.default, option=ORJSON_OPTIONS)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Valid in JSON but not in JavaScript; escaped like DRF does
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser on orjson, falling back to the stdlib parser without it."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        body = stream.read()
+        try:
+            if codecs.lookup(encoding).name != 'utf-8':
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (ValueError, LookupError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
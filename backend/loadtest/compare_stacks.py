@@ -0,0 +1,134 @@
+"""
+Compare the sync (WSGI) and async (ASGI) stacks under concurrent load.
+
+Start one single-worker server per stack, e.g.
+
+    gunicorn studyflow.wsgi:application -w 1 -b 127.0.0.1:8001
+    gunicorn studyflow.asgi:application -w 1 -k uvicorn.workers.UvicornWorker -b 127.0.0.1:8002
+
+then run
+
+    python loadtest/compare_stacks.py --sync http://127.0.0.1:8001 \\
+        --async http://127.0.0.1:8002 --path "/api/search/?q=たべ" \\
+        --concurrency 1 8 32 --sync-pid <worker pid> --async-pid <worker pid>
+
+For each concurrency level it prints requests/s, p50/p95 latency, errors and
+the worker's peak RSS, so throughput per worker can be compared at equal
+memory. Only the standard library is used.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import quote, urlsplit
+
+
+async def fetch(host, port, target):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f'GET {target} HTTP/1.1\r\nHost: {host}\r\n'
+            f'Accept: application/json\r\nConnection: close\r\n\r\n'.encode()
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+def rss_kb(pid):
+    """Resident set size of ``pid`` in kB (Linux), or None."""
+    if not pid:
+        return None
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+
+async def run(base_url, paths, concurrency, duration, pid):
+    url = urlsplit(base_url)
+    host, port = url.hostname, url.port or 80
+    latencies = []
+    errors = 0
+    peak_rss = rss_kb(pid)
+    deadline = time.perf_counter() + duration
+
+    async def worker(index):
+        nonlocal errors
+        request_number = index
+        while time.perf_counter() < deadline:
+            target = quote(url.path.rstrip('/') + paths[request_number % len(paths)], safe='/?=&%:,')
+            request_number += concurrency
+            start = time.perf_counter()
+            try:
+                status = await fetch(host, port, target)
+            except OSError:
+                status = None
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors += 1
+
+    async def sample_memory():
+        nonlocal peak_rss
+        while time.perf_counter() < deadline:
+            peak_rss = max(peak_rss or 0, rss_kb(pid) or 0) or None
+            await asyncio.sleep(0.2)
+
+    started = time.perf_counter()
+    await asyncio.gather(sample_memory(), *(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0,
+        'errors': errors,
+        'rss_mb': peak_rss / 1024 if peak_rss else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sync', dest='sync_url', help='Base URL of the WSGI server')
+    parser.add_argument('--async', dest='async_url', help='Base URL of the ASGI server')
+    parser.add_argument('--sync-pid', type=int, help='WSGI worker pid, for RSS')
+    parser.add_argument('--async-pid', type=int, help='ASGI worker pid, for RSS')
+    parser.add_argument('--path', action='append', dest='paths',
+                        help='Request path (repeatable, used round-robin)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per level')
+    args = parser.parse_args()
+    paths = args.paths or ['/api/search/?q=%E3%81%9F%E3%81%B9']
+
+    stacks = [
+        (name, url, pid)
+        for name, url, pid in (
+            ('sync', args.sync_url, args.sync_pid),
+            ('async', args.async_url, args.async_pid),
+        )
+        if url
+    ]
+    if not stacks:
+        parser.error('give --sync and/or --async')
+
+    print(f'{"stack":<7}{"conc":>6}{"reqs":>8}{"req/s":>10}{"p50 ms":>10}'
+          f'{"p95 ms":>10}{"errors":>8}{"rss MB":>9}')
+    for concurrency in args.concurrency:
+        for name, url, pid in stacks:
+            result = asyncio.run(run(url, paths, concurrency, args.duration, pid))
+            rss = f'{result["rss_mb"]:.1f}' if result['rss_mb'] else '-'
+            print(f'{name:<7}{concurrency:>6}{result["requests"]:>8}{result["rps"]:>10.1f}'
+                  f'{result["p50_ms"]:>10.1f}{result["p95_ms"]:>10.1f}'
+                  f'{result["errors"]:>8}{rss:>9}')
+
+
+if __name__ == '__main__':
+    main()
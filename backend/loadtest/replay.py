@@ -0,0 +1,259 @@
+"""
+Replay browsing and practice traffic against a running API and report
+latency percentiles and throughput per route.
+
+Generate a catalog and users first, then start the server, e.g.
+
+    python manage.py generate_catalog --books 5 --users 100 --attempts 1000000
+    gunicorn studyflow.wsgi:application -w 4 -b 127.0.0.1:8000
+
+and run
+
+    python loadtest/replay.py http://127.0.0.1:8000 --users 50 --duration 60
+
+Each virtual user logs in as one of the generated users, then loops over
+sessions: a browsing session opens a book's chapter list, a chapter and its
+vocabulary, grammar, a search and a deck; a practice session loads a
+chapter's questions, submits answers and checks the review queue, progress
+and attempt history. Only the standard library is used.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from urllib.parse import quote, urlencode, urlsplit
+
+SEARCH_TERMS = ['たべ', 'ます', 'ている', 'học', 'an', '日本']
+
+
+class Client:
+    def __init__(self, base_url, stats):
+        url = urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.root = url.path.rstrip('/')
+        self.stats = stats
+
+    async def request(self, route, method, path, params=None, body=None, form=None, cookies=None):
+        """
+        One HTTP/1.0 request (so the body is never chunked). Records its
+        latency under ``route``; returns ``(status, decoded JSON or None)``.
+        ``cookies`` is sent and updated from the response, like a browser
+        session; unsafe methods send its CSRF token.
+        """
+        target = quote(self.root + path, safe='/%:')
+        if params:
+            target += '?' + urlencode(params)
+        headers = [
+            f'{method} {target} HTTP/1.0',
+            f'Host: {self.host}',
+            'Accept: application/json',
+        ]
+        payload = b''
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers.append('Content-Type: application/json')
+        elif form is not None:
+            payload = urlencode(form).encode()
+            headers.append('Content-Type: application/x-www-form-urlencoded')
+        if payload:
+            headers.append(f'Content-Length: {len(payload)}')
+        if cookies:
+            headers.append('Cookie: ' + '; '.join(f'{name}={value}' for name, value in cookies.items()))
+            if method != 'GET' and 'csrftoken' in cookies:
+                headers.append(f'X-CSRFToken: {cookies["csrftoken"]}')
+
+        start = time.perf_counter()
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode() + payload)
+                await writer.drain()
+                response = await reader.read()
+            finally:
+                writer.close()
+            head, _, content = response.partition(b'\r\n\r\n')
+            status_line, *response_headers = head.decode('latin-1').split('\r\n')
+            status = int(status_line.split(None, 2)[1])
+        except (OSError, IndexError, ValueError):
+            status, content, response_headers = None, b'', []
+        self.stats.record(route, time.perf_counter() - start, status)
+
+        if cookies is not None:
+            for header in response_headers:
+                name, _, value = header.partition(':')
+                if name.lower() == 'set-cookie':
+                    cookie_name, _, cookie_value = value.strip().split(';')[0].partition('=')
+                    cookies[cookie_name] = cookie_value
+        try:
+            return status, json.loads(content) if content else None
+        except ValueError:
+            return status, None
+
+
+async def login(client, username, password):
+    """Session cookies of ``username``, logged in like the browsable API."""
+    cookies = {}
+    await client.request('setup', 'GET', '/csrf/', cookies=cookies)
+    await client.request('setup', 'POST', '/api-auth/login/', form={
+        'username': username,
+        'password': password,
+        'csrfmiddlewaretoken': cookies.get('csrftoken', ''),
+    }, cookies=cookies)
+    if 'sessionid' not in cookies:
+        raise SystemExit(f'Could not log in as {username}')
+    return cookies
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, route, seconds, status):
+        self.latencies[route].append(seconds)
+        if status is None or status >= 400:
+            self.errors[route] += 1
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def results(page):
+    """Rows of a paginated (or plain) list response."""
+    if isinstance(page, dict):
+        return page.get('results', [])
+    return page or []
+
+
+async def browse(client, rng, catalog):
+    book = rng.choice(list(catalog))
+    chapter = rng.choice(catalog[book])
+    await client.request('GET /api/chapters/?book_name', 'GET', '/api/chapters/',
+                         {'book_name': book, 'page_size': 100})
+    await client.request('GET /api/chapters/{id}/', 'GET', f'/api/chapters/{chapter}/')
+    await client.request('GET /api/vocabularies/?chapter', 'GET', '/api/vocabularies/',
+                         {'chapter': chapter, 'page_size': 100})
+    await client.request('GET /api/grammar_patterns/?chapter', 'GET', '/api/grammar_patterns/',
+                         {'chapter': chapter})
+    await client.request('GET /api/search/', 'GET', '/api/search/', {'q': rng.choice(SEARCH_TERMS)})
+    chapters = rng.sample(catalog[book], min(3, len(catalog[book])))
+    await client.request('GET /api/decks/', 'GET', '/api/decks/', {
+        'chapters': ','.join(map(str, chapters)),
+        'type': rng.choice(['vocabulary', 'grammar']),
+        'sample': 20,
+    })
+
+
+async def practice(client, rng, catalog, session):
+    chapter = rng.choice(rng.choice(list(catalog.values())))
+    question_type = rng.choice(['vocabulary', 'grammar', 'kanji'])
+    _, page = await client.request(
+        'GET /api/input-test-questions/?chapter', 'GET', '/api/input-test-questions/',
+        {'chapter': chapter, 'question_type': question_type, 'page_size': 20}, cookies=session
+    )
+    questions = results(page)
+    if questions:
+        answers = [
+            {
+                'question_id': question['id'],
+                'answer': question['correct_answer'] if rng.random() < 0.7 else 'わからない',
+            }
+            for question in questions
+        ]
+        question = questions[0]
+        await client.request(
+            'POST /api/input-test-questions/{id}/submit_answer/', 'POST',
+            f'/api/input-test-questions/{question["id"]}/submit_answer/',
+            body={'answer': question['correct_answer']}, cookies=session
+        )
+        await client.request(
+            'POST /api/input-test-questions/submit_answers/', 'POST',
+            '/api/input-test-questions/submit_answers/', body={'answers': answers[1:] or answers},
+            cookies=session
+        )
+    await client.request('GET /api/review-queue/', 'GET', '/api/review-queue/', cookies=session)
+    await client.request('GET /api/progress/summary/', 'GET', '/api/progress/summary/', cookies=session)
+    await client.request('GET /api/input-test-attempts/', 'GET', '/api/input-test-attempts/', cookies=session)
+
+
+async def load_catalog(client, prefix):
+    """Chapter ids per book of the generated catalog."""
+    status, page = await client.request('setup', 'GET', '/api/chapters/', {'page_size': 1000})
+    if status != 200:
+        raise SystemExit(f'Could not list chapters (status {status})')
+    catalog = defaultdict(list)
+    for chapter in results(page):
+        if chapter['book_name'].startswith(prefix):
+            catalog[chapter['book_name']].append(chapter['id'])
+    if not catalog:
+        raise SystemExit(f'No books named "{prefix} ..."; run manage.py generate_catalog first')
+    return catalog
+
+
+async def run(args):
+    stats = Stats()
+    client = Client(args.url, stats)
+    catalog = await load_catalog(client, args.prefix)
+    rngs = [random.Random(args.seed + index) for index in range(args.users)]
+    # Log in up front so password hashing is not part of the measurements
+    sessions = await asyncio.gather(*(
+        login(client, f'{args.prefix.lower()}-{rng.randint(1, args.accounts)}', args.password)
+        for rng in rngs
+    ))
+    stats.latencies.clear()
+    stats.errors.clear()
+    deadline = time.perf_counter() + args.duration
+
+    async def virtual_user(rng, session):
+        while time.perf_counter() < deadline:
+            if rng.random() < args.practice:
+                await practice(client, rng, catalog, session)
+            else:
+                await browse(client, rng, catalog)
+            if args.think:
+                await asyncio.sleep(rng.expovariate(1 / args.think))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user(rng, session) for rng, session in zip(rngs, sessions)))
+    return stats, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('url', help='Base URL of the API server')
+    parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds')
+    parser.add_argument('--practice', type=float, default=0.4,
+                        help='Share of sessions that practice instead of browsing')
+    parser.add_argument('--think', type=float, default=0,
+                        help='Mean think time between sessions, in seconds')
+    parser.add_argument('--prefix', default='Synthetic', help='generate_catalog --prefix')
+    parser.add_argument('--accounts', type=int, default=100, help='generate_catalog --users')
+    parser.add_argument('--password', default='loadtest', help='generate_catalog --password')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    stats, elapsed = asyncio.run(run(args))
+
+    print(f'{"route":<52}{"reqs":>8}{"req/s":>9}{"p50 ms":>9}{"p95 ms":>9}'
+          f'{"p99 ms":>9}{"errors":>8}')
+    total = 0
+    for route in sorted(stats.latencies):
+        latencies = sorted(stats.latencies[route])
+        total += len(latencies)
+        print(f'{route:<52}{len(latencies):>8}{len(latencies) / elapsed:>9.1f}'
+              f'{percentile(latencies, 0.50) * 1000:>9.1f}'
+              f'{percentile(latencies, 0.95) * 1000:>9.1f}'
+              f'{percentile(latencies, 0.99) * 1000:>9.1f}{stats.errors[route]:>8}')
+    print(f'{"total":<52}{total:>8}{total / elapsed:>9.1f}'
+          f'{"":>27}{sum(stats.errors.values()):>8}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from threading import Lock
+
+from common.japanese import normalize
+
+CACHE_SIZE = 10000
+
+
+def _is_kanji(char):
+    return '一' <= char <= '鿿' or char == '々'
+
+
+def _is_hiragana(char):
+    return 'ぁ' <= char <= 'ゟ'
+
+
+def exact_key(text):
+    """Kana/width/case folded, punctuation and whitespace removed."""
+    return normalize(text).replace(' ', '')
+
+
+def okurigana_key(text):
+    """
+    Key that is equal for okurigana spelling variants of compound words:
+    kana between two kanji are dropped (取り扱い -> 取扱い, 申し込み ->
+    申込み). Kana after the last kanji are kept as they are, since they
+    tell different verbs apart (見る/見せる, 上がる/上げる); other variants
+    such as 行なう/行う belong in a question's ``accepted_answers``.
+    Returns None for answers without kanji.
+    """
+    key = exact_key(text)
+    if not any(_is_kanji(char) for char in key):
+        return None
+
+    result = []
+    pending = []  # hiragana seen since the last kanji
+    seen_kanji = False
+    for char in key:
+        if _is_hiragana(char) and seen_kanji:
+            pending.append(char)
+            continue
+        if _is_kanji(char):
+            seen_kanji = True
+        else:
+            result.extend(pending)
+        pending = []
+        result.append(char)
+    result.extend(pending)
+    return 'okurigana:' + ''.join(result)
+
+
+DEFAULT_NORMALIZERS = (exact_key, okurigana_key)
+
+
+class AnswerGrader:
+    """
+    Grades free-text answers against a question's accepted answers
+    (``correct_answer`` plus ``accepted_answers``).
+
+    Each normalizer maps an answer to a comparison key (or None); an answer
+    is correct when any of its keys is among the keys of the accepted
+    answers. The compiled key set of each question is cached per process by
+    ``(model, id, updated_at)``, so editing a question invalidates it.
+    """
+
+    def __init__(self, normalizers=DEFAULT_NORMALIZERS, cache_size=CACHE_SIZE):
+        self.normalizers = tuple(normalizers)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = Lock()
+
+    def keys(self, answer):
+        keys = set()
+        for normalizer in self.normalizers:
+            key = normalizer(answer or '')
+            if key:
+                keys.add(key)
+        return keys
+
+    def accepted_keys(self, question):
+        cache_key = (question._meta.label, question.pk, question.updated_at)
+        with self._lock:
+            keys = self._cache.get(cache_key)
+            if keys is not None:
+                self._cache.move_to_end(cache_key)
+                return keys
+
+        accepted = question.accepted_answers
+        if not isinstance(accepted, list):
+            accepted = []
+        keys = set()
+        for answer in [question.correct_answer, *accepted]:
+            # Rows written around the serializers may hold anything
+            if isinstance(answer, str):
+                keys |= self.keys(answer)
+        keys = frozenset(keys)
+
+        with self._lock:
+            self._cache[cache_key] = keys
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return keys
+
+    def grade(self, question, answer):
+        return not self.keys(answer).isdisjoint(self.accepted_keys(question))
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+default_grader = AnswerGrader()
+
+
+def grade(question, answer):
+    """Grade ``answer`` for ``question`` with the default grader."""
+    return default_grader.grade(question, answer)
@@ -1,16 +1,48 @@
 from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from chapters.models import Chapter
+from common.batches import update_in_batches
 from practice.models import InputTestQuestion
 
+# Same rule as before: a falsy book_name or chapter_number needs backfilling
+MISSING = Q(book_name__isnull=True) | Q(book_name='') | Q(chapter_number__isnull=True) | Q(chapter_number=0)
+
+
 class Command(BaseCommand):
-    help = 'Backfill book_name and chapter_number for InputTestQuestion records using their related chapter.'
+    help = (
+        'Backfill book_name and chapter_number for InputTestQuestion records '
+        'using their related chapter, with one UPDATE ... FROM per id range.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000, help='Ids per UPDATE')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows to backfill')
 
     def handle(self, *args, **options):
-        updated = 0
-        for q in InputTestQuestion.objects.all():
-            if not q.book_name or not q.chapter_number:
-                if q.chapter:
-                    q.book_name = q.chapter.book_name
-                    q.chapter_number = q.chapter.chapter_number
-                    q.save()
-                    updated += 1
-        self.stdout.write(self.style.SUCCESS(f'Backfilled {updated} InputTestQuestion records.')) 
\ No newline at end of file
+        missing = InputTestQuestion.objects.filter(MISSING).count()
+        self.stdout.write(f'{missing} InputTestQuestion records need backfilling.')
+        if options['dry_run'] or not missing:
+            return
+
+        quote = connection.ops.quote_name
+        updated = update_in_batches(
+            InputTestQuestion,
+            f"""
+            UPDATE {quote(InputTestQuestion._meta.db_table)} AS q
+            SET book_name = c.book_name,
+                chapter_number = c.chapter_number,
+                updated_at = %s
+            FROM {quote(Chapter._meta.db_table)} AS c
+            WHERE c.id = q.chapter_id
+              AND (q.book_name IS NULL OR q.book_name = ''
+                   OR q.chapter_number IS NULL OR q.chapter_number = 0)
+              AND q.id >= %s AND q.id < %s
+            """,
+            [timezone.now()],
+            options['batch_size'],
+            stdout=self.stdout
+        )
+        self.stdout.write(self.style.SUCCESS(f'Backfilled {updated} InputTestQuestion records.'))
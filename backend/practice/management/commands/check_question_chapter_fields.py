@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from practice.signals import drifted_questions, misfiled_questions, sync_all_question_chapter_fields
+
+
+class Command(BaseCommand):
+    help = (
+        'Reports InputTestQuestion rows whose book_name/chapter_number differ '
+        'from their chapter (one anti-join query); --fix copies them over. '
+        'The chapter FK is the source of truth, never the columns.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help='Drifted rows to list')
+        parser.add_argument('--fix', action='store_true', help='Copy the chapter fields onto drifted rows')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Ids per UPDATE with --fix')
+
+    def handle(self, *args, **options):
+        drifted = drifted_questions()
+        count = drifted.count()
+        if not count:
+            self.stdout.write(self.style.SUCCESS('All questions match their chapter.'))
+            return
+
+        self.stdout.write(f'{count} questions differ from their chapter:')
+        sample = drifted.order_by('id').values_list(
+            'id', 'book_name', 'chapter_number', 'chapter_id',
+            'chapter__book_name', 'chapter__chapter_number'
+        )[:options['limit']]
+        for row in sample:
+            question_id, book_name, chapter_number, chapter_id, chapter_book, chapter_chapter = row
+            self.stdout.write(
+                f'  question {question_id}: {book_name!r} {chapter_number} != '
+                f'chapter {chapter_id}: {chapter_book!r} {chapter_chapter}'
+            )
+        misfiled = misfiled_questions().count()
+        if misfiled:
+            self.stdout.write(self.style.WARNING(
+                f'{misfiled} of them name another existing chapter; --fix overwrites that. '
+                f'If they belong there, run fix_mismatched_questions --repoint-from-columns first.'
+            ))
+        if not options['fix']:
+            raise CommandError('Denormalized chapter fields have drifted; rerun with --fix')
+
+        updated = sync_all_question_chapter_fields(options['batch_size'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f'Fixed {updated} questions'))
@@ -1,58 +1,159 @@
-from django.core.management.base import BaseCommand
-from practice.models import InputTestQuestion
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
 from chapters.models import Chapter
+from common import constant
+from common.batches import update_in_batches
+from practice.models import InputTestQuestion
+from practice.signals import drifted_questions, misfiled_questions, sync_all_question_chapter_fields
 
 
 class Command(BaseCommand):
     help = (
-        'Fixes mismatched questions by updating their chapter FK and '
-        'question_type'
+        'Fixes mismatched questions. By default book_name and chapter_number '
+        'are copied from the chapter FK, the source of truth (as in '
+        'check_question_chapter_fields --fix). With --repoint-from-columns '
+        'the FK is moved to the chapter the columns name instead, one '
+        'UPDATE ... FROM per id range; run that first, since the sync '
+        'overwrites the columns. --question-type sets the type of the '
+        'questions of one book or chapter.'
     )
 
-    def handle(self, *args, **options):
-        book_name = 'aaa'
-        chapter_number = 33
-        question_type = 'vocabulary'
-
-        # Get or create the correct chapter
-        chapter, created = Chapter.objects.get_or_create(
-            book_name=book_name,
-            chapter_number=chapter_number,
-            defaults={
-                'title': f'Chapter {chapter_number}',
-                'level': 'N5'  # Default level
-            }
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repoint-from-columns', action='store_true',
+            help='Point the chapter FK at the chapter named by book_name and chapter_number'
+        )
+        parser.add_argument('--book-name', help='Only questions of this book')
+        parser.add_argument('--chapter-number', type=int, help='Only questions of this chapter number')
+        parser.add_argument(
+            '--question-type',
+            choices=[value for value, _ in InputTestQuestion.QUESTION_TYPES],
+            help='Also set question_type on the selected questions'
         )
-        if created:
-            self.stdout.write(
-                self.style.SUCCESS(f'Created chapter: {chapter}')
+        parser.add_argument(
+            '--create-chapter', action='store_true',
+            help='With --repoint-from-columns, create the chapter given by --book-name '
+                 'and --chapter-number if missing'
+        )
+        parser.add_argument(
+            '--level', default='N5', choices=[value for value, _ in constant.LEVEL_CHOICES],
+            help='Level of a chapter created by --create-chapter'
+        )
+        parser.add_argument('--batch-size', type=int, default=10000, help='Ids per UPDATE')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows to fix')
+
+    def handle(self, *args, **options):
+        book_name = options['book_name']
+        chapter_number = options['chapter_number']
+        question_type = options['question_type']
+        repoint = options['repoint_from_columns']
+        if question_type and book_name is None:
+            raise CommandError('--question-type needs --book-name')
+        if not repoint and question_type is None and (book_name is not None or chapter_number is not None):
+            raise CommandError(
+                '--book-name and --chapter-number select questions for '
+                '--repoint-from-columns or --question-type'
             )
+        if options['create_chapter']:
+            if not repoint:
+                raise CommandError('--create-chapter needs --repoint-from-columns')
+            if book_name is None or chapter_number is None:
+                raise CommandError('--create-chapter needs --book-name and --chapter-number')
+            self.ensure_chapter(book_name, chapter_number, options['level'], options['dry_run'])
+
+        if repoint:
+            self.repoint(book_name, chapter_number, options['batch_size'], options['dry_run'])
         else:
-            self.stdout.write(
-                self.style.SUCCESS(f'Found chapter: {chapter}')
-            )
+            self.sync(options['batch_size'], options['dry_run'])
+        if question_type is not None:
+            self.set_question_type(book_name, chapter_number, question_type, options['dry_run'])
 
-        # Find questions with matching book_name and chapter_number
-        questions = InputTestQuestion.objects.filter(
-            book_name=book_name, chapter_number=chapter_number
-        )
-        count = questions.count()
-        self.stdout.write(
-            f'Found {count} questions with book_name={book_name} and '
-            f'chapter_number={chapter_number}'
+    def sync(self, batch_size, dry_run):
+        misfiled = misfiled_questions().count()
+        if misfiled:
+            self.stdout.write(self.style.WARNING(
+                f'{misfiled} questions name another existing chapter; syncing overwrites '
+                f'that (see --repoint-from-columns)'
+            ))
+        drifted = drifted_questions().count()
+        self.stdout.write(f'{drifted} questions differ from their chapter')
+        if drifted and not dry_run:
+            updated = sync_all_question_chapter_fields(batch_size, stdout=self.stdout)
+            self.stdout.write(self.style.SUCCESS(f'Updated {updated} questions from their chapter'))
+
+    def repoint(self, book_name, chapter_number, batch_size, dry_run):
+        # Questions whose book_name/chapter_number name an existing chapter
+        # other than their FK
+        conditions = ['q.chapter_id <> c.id']
+        filters = {}
+        if book_name is not None:
+            conditions.append('q.book_name = %s')
+            filters['book_name'] = book_name
+        if chapter_number is not None:
+            conditions.append('q.chapter_number = %s')
+            filters['chapter_number'] = chapter_number
+        where = ' AND '.join(conditions)
+        params = list(filters.values())
+
+        mismatched = misfiled_questions().filter(**filters).count()
+        orphans = InputTestQuestion.objects.filter(
+            book_name__isnull=False, chapter_number__isnull=False, **filters
+        ).exclude(
+            Exists(Chapter.objects.filter(
+                book_name=OuterRef('book_name'),
+                chapter_number=OuterRef('chapter_number')
+            ))
+        ).count()
+        self.stdout.write(f'{mismatched} questions name another existing chapter')
+        if orphans:
+            self.stdout.write(self.style.WARNING(
+                f'{orphans} questions name no existing chapter and are left as they are '
+                f'(see --create-chapter)'
+            ))
+        if dry_run or not mismatched:
+            return
+
+        quote = connection.ops.quote_name
+        updated = update_in_batches(
+            InputTestQuestion,
+            f"""
+            UPDATE {quote(InputTestQuestion._meta.db_table)} AS q
+            SET chapter_id = c.id,
+                updated_at = %s
+            FROM {quote(Chapter._meta.db_table)} AS c
+            WHERE c.book_name = q.book_name
+              AND c.chapter_number = q.chapter_number
+              AND {where}
+              AND q.id >= %s AND q.id < %s
+            """,
+            [timezone.now(), *params],
+            batch_size,
+            stdout=self.stdout
         )
+        self.stdout.write(self.style.SUCCESS(f'Moved {updated} questions to the chapter they name'))
 
-        # Update each question to point to the correct chapter and set question_type
-        updated = 0
-        for q in questions:
-            q.chapter = chapter
-            q.question_type = question_type
-            q.save()
-            updated += 1
-
-        self.stdout.write(
-            self.style.SUCCESS(
-                f'Updated {updated} questions to chapter {chapter.id} with '
-                f'question_type={question_type}'
+    def set_question_type(self, book_name, chapter_number, question_type, dry_run):
+        # Selected by their chapter, so the result does not depend on drift
+        questions = InputTestQuestion.objects.filter(chapter__book_name=book_name)
+        if chapter_number is not None:
+            questions = questions.filter(chapter__chapter_number=chapter_number)
+        questions = questions.exclude(question_type=question_type)
+        self.stdout.write(f'{questions.count()} questions of another type')
+        if not dry_run:
+            updated = questions.update(question_type=question_type, updated_at=timezone.now())
+            self.stdout.write(self.style.SUCCESS(f'Set question_type={question_type} on {updated} questions'))
+
+    def ensure_chapter(self, book_name, chapter_number, level, dry_run):
+        chapter = Chapter.objects.filter(book_name=book_name, chapter_number=chapter_number).first()
+        if chapter is not None:
+            self.stdout.write(f'Found chapter: {chapter}')
+        elif dry_run:
+            self.stdout.write(f'Would create chapter {book_name} {chapter_number}')
+        else:
+            chapter = Chapter.objects.create(
+                book_name=book_name, chapter_number=chapter_number, level=level
             )
-        ) 
\ No newline at end of file
+            self.stdout.write(self.style.SUCCESS(f'Created chapter: {chapter}'))
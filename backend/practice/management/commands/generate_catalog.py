@@ -0,0 +1,243 @@
+import csv
+import io
+import random
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from chapters.models import Chapter, GrammarExample, GrammarPattern, GrammarUsage, Vocabulary
+from common.cache import invalidate
+from practice.models import InputTestAttempt, InputTestQuestion
+
+KANA = (
+    'あいうえおかきくけこがぎぐげごさしすせそざじずぜぞたちつてとだでど'
+    'なにぬねのはひふへほばびぶべぼぱぴぷぺぽまみむめもやゆよらりるれろわん'
+)
+KANJI = '日月火水木金土山川田人口目耳手足学生先年時間食飲見聞読書話買行来会社電車駅店'
+ENDINGS = ('ます', 'ました', 'ません', 'る', 'い', 'な', '')
+MEANINGS = ('ăn', 'uống', 'xem', 'nghe', 'đọc', 'viết', 'nói', 'mua', 'đi', 'đến', 'học', 'làm')
+PATTERNS = ('～ている', '～てもいい', '～なければならない', '～たことがある', '～ながら', '～そうです')
+SENTENCES = ('今、ご飯を食べています。', '毎日日本語を勉強しています。', '駅で友達に会いました。')
+TRANSLATIONS = ('Bây giờ tôi đang ăn cơm.', 'Mỗi ngày tôi học tiếng Nhật.', 'Tôi đã gặp bạn ở ga.')
+
+
+def kana_word(rng, syllables):
+    return ''.join(rng.choice(KANA) for _ in range(syllables))
+
+
+def vocabulary_word(rng):
+    """Reading, and usually a kanji spelling, like "たべます 食べます"."""
+    reading = kana_word(rng, rng.randint(2, 4)) + rng.choice(ENDINGS)
+    if rng.random() < 0.3:
+        return reading
+    return f'{reading} {"".join(rng.sample(KANJI, rng.randint(1, 2)))}{rng.choice(ENDINGS)}'
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates a synthetic catalog (books x chapters with vocabulary, '
+        'grammar and input-test questions) plus users and attempts, for '
+        'local performance work. Attempts are loaded with COPY on Postgres.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=5)
+        parser.add_argument('--chapters', type=int, default=25, help='Chapters per book')
+        parser.add_argument('--words', type=int, default=50, help='Vocabulary per chapter')
+        parser.add_argument('--patterns', type=int, default=8, help='Grammar patterns per chapter')
+        parser.add_argument('--usages', type=int, default=2, help='Usages per pattern')
+        parser.add_argument('--examples', type=int, default=2, help='Examples per usage')
+        parser.add_argument(
+            '--questions', type=int, default=20,
+            help='Input-test questions per chapter and question type'
+        )
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--attempts', type=int, default=100000, help='Attempts in total')
+        parser.add_argument('--days', type=int, default=90, help='Spread attempts over this many days')
+        parser.add_argument('--password', default='loadtest', help='Password of the generated users')
+        parser.add_argument('--prefix', default='Synthetic', help='Book and username prefix')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (same seed, same catalog)')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--replace', action='store_true',
+            help='Delete books and users with this prefix first'
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        prefix = options['prefix']
+        books = Chapter.objects.filter(book_name__startswith=f'{prefix} ')
+        users = User.objects.filter(username__startswith=f'{prefix.lower()}-')
+
+        if options['replace']:
+            self.timed('Removed previous data', self.delete, books, users)
+        elif books.exists() or users.exists():
+            raise CommandError(f'Data with prefix "{prefix}" exists; pass --replace')
+
+        questions = self.timed('Catalog', self.create_catalog, prefix, options)
+        user_ids = self.timed(
+            f'{options["users"]} users', self.create_users,
+            prefix, options['users'], options['password']
+        )
+        if user_ids and questions:
+            self.timed(
+                f'{options["attempts"]} attempts', self.create_attempts,
+                user_ids, questions, options['attempts'], options['days']
+            )
+            self.timed(
+                'Progress rollups', call_command,
+                'rebuild_progress_rollups', users=user_ids, stdout=self.stdout
+            )
+
+        # bulk_create sends no signals, so drop cached catalog responses here
+        invalidate('chapters', 'vocabularies', 'grammar_patterns')
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {options["books"]} books, {len(questions)} questions, '
+            f'{len(user_ids)} users (password "{options["password"]}")'
+        ))
+
+    def timed(self, label, function, *args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        self.stdout.write(f'{label}: {time.perf_counter() - start:.1f}s')
+        return result
+
+    def delete(self, books, users):
+        # Attempts first: one DELETE instead of collecting them per question
+        InputTestAttempt.objects.filter(question__chapter__in=books).delete()
+        InputTestAttempt.objects.filter(user__in=users).delete()
+        books.delete()
+        users.delete()
+
+    def bulk_create(self, model, objects):
+        return model.objects.bulk_create(objects, batch_size=self.batch_size)
+
+    @transaction.atomic
+    def create_catalog(self, prefix, options):
+        """Creates the books; returns ``(question id, correct answer)`` pairs."""
+        rng = self.rng
+        chapters = self.bulk_create(Chapter, [
+            Chapter(
+                level=rng.choice(('N5', 'N4', 'N3', 'N2', 'N1')),
+                book_name=f'{prefix} {book}',
+                chapter_number=number
+            )
+            for book in range(1, options['books'] + 1)
+            for number in range(1, options['chapters'] + 1)
+        ])
+
+        vocabularies = []
+        for chapter in chapters:
+            for _ in range(options['words']):
+                vocabulary = Vocabulary(
+                    chapter=chapter,
+                    word=vocabulary_word(rng),
+                    meaning=rng.choice(MEANINGS),
+                    example=rng.choice(SENTENCES),
+                    example_translation=rng.choice(TRANSLATIONS)
+                )
+                vocabulary.update_search_keys()
+                vocabularies.append(vocabulary)
+        self.bulk_create(Vocabulary, vocabularies)
+
+        patterns = []
+        for chapter in chapters:
+            for index in range(options['patterns']):
+                pattern = GrammarPattern(
+                    chapter=chapter,
+                    pattern=f'{rng.choice(PATTERNS)}{index}',
+                    description='進行中の動作や結果の状態を表す。'
+                )
+                pattern.update_search_keys()
+                patterns.append(pattern)
+        patterns = self.bulk_create(GrammarPattern, patterns)
+        usages = self.bulk_create(GrammarUsage, [
+            GrammarUsage(pattern=pattern, explanation='動作の継続', order=order)
+            for pattern in patterns
+            for order in range(options['usages'])
+        ])
+        self.bulk_create(GrammarExample, [
+            GrammarExample(
+                usage=usage,
+                sentence=rng.choice(SENTENCES),
+                translation=rng.choice(TRANSLATIONS),
+                order=order
+            )
+            for usage in usages
+            for order in range(options['examples'])
+        ])
+
+        questions = self.bulk_create(InputTestQuestion, [
+            InputTestQuestion(
+                chapter=chapter,
+                book_name=chapter.book_name,
+                chapter_number=chapter.chapter_number,
+                question_type=question_type,
+                question_text=f'{rng.choice(MEANINGS)} ({question_type} {index})',
+                correct_answer=kana_word(rng, 3) + rng.choice(ENDINGS)
+            )
+            for chapter in chapters
+            for question_type, _ in InputTestQuestion.QUESTION_TYPES
+            for index in range(options['questions'])
+        ])
+        return [(question.id, question.correct_answer) for question in questions]
+
+    def create_users(self, prefix, count, password):
+        password = make_password(password)  # hashed once, not per user
+        users = self.bulk_create(User, [
+            User(username=f'{prefix.lower()}-{index}', password=password)
+            for index in range(1, count + 1)
+        ])
+        return [user.id for user in users]
+
+    def attempt_rows(self, user_ids, questions, count, days):
+        rng = self.rng
+        now = timezone.now()
+        span = days * 24 * 3600
+        for _ in range(count):
+            question_id, answer = rng.choice(questions)
+            is_correct = rng.random() < 0.7
+            yield (
+                rng.choice(user_ids),
+                question_id,
+                answer if is_correct else kana_word(rng, 3),
+                is_correct,
+                now - timedelta(seconds=rng.randrange(span)),
+            )
+
+    @transaction.atomic
+    def create_attempts(self, user_ids, questions, count, days):
+        # Chunked, so memory stays flat for any count
+        rows = self.attempt_rows(user_ids, questions, count, days)
+        while chunk := list(islice(rows, self.batch_size * 10)):
+            if connection.vendor == 'postgresql':
+                self.copy_attempts(chunk)
+            else:
+                # created_at is auto_now_add, so here every attempt is "now"
+                self.bulk_create(InputTestAttempt, [
+                    InputTestAttempt(
+                        user_id=user_id, question_id=question_id,
+                        user_answer=user_answer, is_correct=is_correct
+                    )
+                    for user_id, question_id, user_answer, is_correct, _ in chunk
+                ])
+
+    def copy_attempts(self, rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        table = connection.ops.quote_name(InputTestAttempt._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f'COPY {table} (user_id, question_id, user_answer, is_correct, created_at) '
+                f'FROM STDIN WITH (FORMAT csv)',
+                buffer
+            )
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, Q
+
+from practice.models import InputTestAttempt, ProgressRollup
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuilds ProgressRollup rows from InputTestAttempt, for all users '
+        'or only the given ones'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', type=int, action='append', dest='users',
+            help='Only rebuild this user id (repeatable)'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        attempts = InputTestAttempt.objects.filter(user__isnull=False)
+        rollups = ProgressRollup.objects.all()
+        if options['users']:
+            attempts = attempts.filter(user__in=options['users'])
+            rollups = rollups.filter(user__in=options['users'])
+
+        totals = (
+            attempts
+            .values('user', 'question__chapter', 'question__question_type')
+            .annotate(
+                attempts=Count('id'),
+                corrects=Count('id', filter=Q(is_correct=True)),
+                last_attempt_at=Max('created_at')
+            )
+            .order_by()
+        )
+
+        with transaction.atomic():
+            deleted, _ = rollups.delete()
+            created = ProgressRollup.objects.bulk_create(
+                (
+                    ProgressRollup(
+                        user_id=row['user'],
+                        chapter_id=row['question__chapter'],
+                        question_type=row['question__question_type'],
+                        attempts=row['attempts'],
+                        corrects=row['corrects'],
+                        last_attempt_at=row['last_attempt_at']
+                    )
+                    for row in totals.iterator()
+                ),
+                batch_size=options['batch_size']
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Rebuilt {len(created)} rollups (removed {deleted})'
+            )
+        )
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practice', '0004_alter_inputtestattempt_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ease', models.FloatField(default=2.5)),
+                ('interval', models.PositiveIntegerField(default=0)),
+                ('repetitions', models.PositiveIntegerField(default=0)),
+                ('due_at', models.DateTimeField()),
+                ('last_reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_states', to='practice.inputtestquestion')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='review_states', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Review States',
+                'indexes': [models.Index(fields=['user', 'due_at'], name='reviewstate_user_due_idx')],
+                'unique_together': {('user', 'question')},
+            },
+        ),
+    ]
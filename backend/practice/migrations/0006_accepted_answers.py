@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('practice', '0005_reviewstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inputtestquestion',
+            name='accepted_answers',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='practicequestion',
+            name='accepted_answers',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chapters', '0011_search_keys'),
+        ('practice', '0006_accepted_answers'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('question_type', models.CharField(choices=[('vocabulary', 'Vocabulary'), ('grammar', 'Grammar'), ('kanji', 'Kanji')], max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('corrects', models.PositiveIntegerField(default=0)),
+                ('last_attempt_at', models.DateTimeField()),
+                ('chapter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_rollups', to='chapters.chapter')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Progress Rollups',
+                'unique_together': {('user', 'chapter', 'question_type')},
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chapters', '0011_search_keys'),
+        ('practice', '0007_progressrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inputtestattempt',
+            index=models.Index(condition=models.Q(('user__isnull', False)), fields=['user', '-created_at'], name='inputtestattempt_user_recent'),
+        ),
+        migrations.AddIndex(
+            model_name='inputtestquestion',
+            index=models.Index(fields=['book_name', 'chapter_number', 'question_type'], name='inputtestq_book_chapter_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inputtestquestion',
+            index=models.Index(fields=['chapter', 'question_type', 'created_at'], name='inputtestq_chapter_type_idx'),
+        ),
+    ]
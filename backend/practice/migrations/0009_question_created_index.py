@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-18 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chapters', '0012_vocabulary_created_index'),
+        ('practice', '0008_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inputtestquestion',
+            index=models.Index(fields=['created_at', 'id'], name='inputtestq_created_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
-from django.db import models
+from django.db import connection, models
+from django.utils import timezone
 from django.contrib.auth.models import User
-from chapters.models import Chapter, Vocabulary
+from chapters.models import Chapter, ChapterChildMixin, Vocabulary
+from .grading import grade
 
 
 class PracticeActivity(models.Model):
@@ -28,7 +30,7 @@ class PracticeActivity(models.Model):
         return f"{self.get_activity_type_display()} - {self.chapter.title}"
 
 
-class InputTestQuestion(models.Model):
+class InputTestQuestion(ChapterChildMixin, models.Model):
     QUESTION_TYPES = [
         ('vocabulary', 'Vocabulary'),
         ('grammar', 'Grammar'),
@@ -41,6 +43,8 @@ class InputTestQuestion(models.Model):
     question_type = models.CharField(max_length=20, choices=QUESTION_TYPES)
     question_text = models.CharField(max_length=500)
     correct_answer = models.CharField(max_length=200)
+    # Alternative spellings also graded as correct
+    accepted_answers = models.JSONField(default=list, blank=True)
     hint = models.CharField(max_length=200, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -48,10 +52,44 @@ class InputTestQuestion(models.Model):
     class Meta:
         verbose_name_plural = "Input Test Questions"
         ordering = ['chapter', 'question_type', 'created_at']
+        indexes = [
+            # Test pages load questions by book, chapter number and type
+            models.Index(
+                fields=['book_name', 'chapter_number', 'question_type'],
+                name='inputtestq_book_chapter_idx'
+            ),
+            # Filtered by chapter and type, listed in Meta.ordering
+            models.Index(
+                fields=['chapter', 'question_type', 'created_at'],
+                name='inputtestq_chapter_type_idx'
+            ),
+            # Keyset pagination (common.pagination.KeysetPagination)
+            models.Index(fields=['created_at', 'id'], name='inputtestq_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_question_type_display()} - {self.question_text[:50]}"
 
+    def save(self, *args, **kwargs):
+        # book_name/chapter_number always follow the chapter; renames are
+        # pushed to existing questions by practice.signals. The chapter is
+        # only fetched for new questions and ones moved to another chapter.
+        chapter_field = self._meta.get_field('chapter')
+        if (
+            self._state.adding
+            or self.chapter_id != getattr(self, 'loaded_chapter_id', None)
+            or chapter_field.is_cached(self)
+        ):
+            self.book_name = self.chapter.book_name
+            self.chapter_number = self.chapter.chapter_number
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'chapter' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'book_name', 'chapter_number'}
+        super().save(*args, **kwargs)
+
+    def check_answer(self, answer):
+        return grade(self, answer)
+
 
 class UserProgress(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress')
@@ -68,6 +106,31 @@ class UserProgress(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.activity.title}"
 
+    @classmethod
+    def add_score(cls, user, activity, points):
+        """
+        Atomically add ``points`` to the user's score for ``activity`` and
+        return the new score. One upsert statement
+        (INSERT ... ON CONFLICT DO UPDATE SET score = score + points), so
+        concurrent submissions cannot lose increments.
+        """
+        table = connection.ops.quote_name(cls._meta.db_table)
+        now = timezone.now()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table}
+                    (user_id, activity_id, score, completed, last_attempt, created_at)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (user_id, activity_id) DO UPDATE
+                SET score = {table}.score + EXCLUDED.score,
+                    last_attempt = EXCLUDED.last_attempt
+                RETURNING score
+                """,
+                [user.pk, activity.pk, points, False, now, now]
+            )
+            return cursor.fetchone()[0]
+
 
 class InputTestAttempt(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='input_test_attempts', null=True, blank=True)
@@ -79,16 +142,111 @@ class InputTestAttempt(models.Model):
     class Meta:
         verbose_name_plural = "Input Test Attempts"
         ordering = ['-created_at']
+        indexes = [
+            # A user's attempts, newest first; anonymous attempts are never listed
+            models.Index(
+                fields=['user', '-created_at'],
+                name='inputtestattempt_user_recent',
+                condition=models.Q(user__isnull=False)
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username if self.user else 'Anonymous'} - {self.question.question_text[:50]}"
 
 
+class ReviewState(models.Model):
+    """
+    Spaced-repetition state of one question for one user, updated on every
+    answer (see practice.scheduling) so the review queue never has to be
+    derived from the attempt history.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='review_states')
+    question = models.ForeignKey(InputTestQuestion, on_delete=models.CASCADE, related_name='review_states')
+    ease = models.FloatField(default=2.5)
+    interval = models.PositiveIntegerField(default=0)  # days
+    repetitions = models.PositiveIntegerField(default=0)
+    due_at = models.DateTimeField()
+    last_reviewed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Review States"
+        unique_together = ['user', 'question']
+        indexes = [
+            models.Index(fields=['user', 'due_at'], name='reviewstate_user_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.question_id} due {self.due_at:%Y-%m-%d}"
+
+
+class ProgressRollup(models.Model):
+    """
+    Running totals of a user's input-test attempts per chapter and question
+    type. Maintained in the same transaction as each attempt (see record())
+    and rebuilt from scratch by ``manage.py rebuild_progress_rollups``.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progress_rollups')
+    chapter = models.ForeignKey(Chapter, on_delete=models.CASCADE, related_name='progress_rollups')
+    question_type = models.CharField(max_length=20, choices=InputTestQuestion.QUESTION_TYPES)
+    attempts = models.PositiveIntegerField(default=0)
+    corrects = models.PositiveIntegerField(default=0)
+    last_attempt_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "Progress Rollups"
+        unique_together = ['user', 'chapter', 'question_type']
+
+    def __str__(self):
+        return f"{self.user.username} - {self.chapter_id} {self.question_type}: {self.corrects}/{self.attempts}"
+
+    @classmethod
+    def record(cls, user, graded, now=None):
+        """
+        Add ``graded`` answers, a list of ``(question, is_correct)``, to the
+        user's rollups with a single multi-row upsert.
+        """
+        totals = {}
+        for question, is_correct in graded:
+            key = (question.chapter_id, question.question_type)
+            attempts, corrects = totals.get(key, (0, 0))
+            totals[key] = (attempts + 1, corrects + int(is_correct))
+        if not totals:
+            return
+
+        now = now or timezone.now()
+        table = connection.ops.quote_name(cls._meta.db_table)
+        rows = []
+        params = []
+        # Rows in key order, so concurrent upserts lock them in the same
+        # order and cannot deadlock each other
+        for (chapter_id, question_type), (attempts, corrects) in sorted(totals.items()):
+            rows.append('(%s, %s, %s, %s, %s, %s)')
+            params += [user.pk, chapter_id, question_type, attempts, corrects, now]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table}
+                    (user_id, chapter_id, question_type, attempts, corrects, last_attempt_at)
+                VALUES {', '.join(rows)}
+                ON CONFLICT (user_id, chapter_id, question_type) DO UPDATE
+                SET attempts = {table}.attempts + EXCLUDED.attempts,
+                    corrects = {table}.corrects + EXCLUDED.corrects,
+                    last_attempt_at = EXCLUDED.last_attempt_at
+                """,
+                params
+            )
+
+
 class PracticeQuestion(models.Model):
     activity = models.ForeignKey(PracticeActivity, on_delete=models.CASCADE, related_name='questions')
     vocabulary = models.ForeignKey(Vocabulary, on_delete=models.CASCADE, related_name='questions')
     question_text = models.TextField()
     correct_answer = models.TextField()
+    # Alternative spellings also graded as correct
+    accepted_answers = models.JSONField(default=list, blank=True)
     options = models.JSONField(default=list)  # For multiple choice questions
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -97,4 +255,7 @@ class PracticeQuestion(models.Model):
         ordering = ['activity', 'created_at']
 
     def __str__(self):
-        return f"{self.activity.title} - {self.vocabulary.word}" 
\ No newline at end of file
+        return f"{self.activity.title} - {self.vocabulary.word}"
+
+    def check_answer(self, answer):
+        return grade(self, answer)
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import ReviewState
+
+# SM-2 parameters
+MIN_EASE = 1.3
+FIRST_INTERVAL = 1  # days
+SECOND_INTERVAL = 6  # days
+
+# Answers are graded right/wrong only, mapped onto SM-2's 0-5 quality scale
+CORRECT_QUALITY = 4
+INCORRECT_QUALITY = 1
+
+REVIEW_FIELDS = ['ease', 'interval', 'repetitions', 'due_at', 'last_reviewed_at']
+
+
+def review(state, is_correct, now):
+    """
+    Apply one SM-2 review to ``state`` (a ReviewState) in place.
+
+    A wrong answer resets the repetition count and makes the question due
+    again immediately; a right answer grows the interval by the ease factor.
+    """
+    quality = CORRECT_QUALITY if is_correct else INCORRECT_QUALITY
+
+    if quality < 3:
+        state.repetitions = 0
+        state.interval = 0
+    else:
+        state.repetitions += 1
+        if state.repetitions == 1:
+            state.interval = FIRST_INTERVAL
+        elif state.repetitions == 2:
+            state.interval = SECOND_INTERVAL
+        else:
+            state.interval = round(state.interval * state.ease)
+
+    state.ease = max(
+        MIN_EASE,
+        state.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    )
+    state.last_reviewed_at = now
+    state.due_at = now + timedelta(days=state.interval)
+    return state
+
+
+def record_review(user, question, is_correct, now=None):
+    """
+    Update (or start) the user's ReviewState for ``question``. Call inside
+    the transaction that records the attempt; the row is locked so
+    concurrent answers are applied one after the other.
+    """
+    now = now or timezone.now()
+    state, _ = ReviewState.objects.select_for_update().get_or_create(
+        user=user,
+        question=question,
+        defaults={'due_at': now}
+    )
+    review(state, is_correct, now)
+    state.save()
+    return state
+
+
+def record_reviews(user, graded, now=None):
+    """
+    Batch version of record_review for ``graded``, a list of
+    ``(question, is_correct)`` in answer order. Existing states are locked
+    and loaded with one query and written back with one bulk_update.
+    Missing states are first inserted with ON CONFLICT DO NOTHING and then
+    locked as well, so a state a concurrent answer created in the meantime
+    gets this review applied on top instead of being overwritten.
+    """
+    now = now or timezone.now()
+
+    def lock(question_ids):
+        return {
+            state.question_id: state
+            for state in ReviewState.objects.select_for_update().filter(
+                user=user, question_id__in=question_ids
+            )
+        }
+
+    question_ids = {question.id for question, _ in graded}
+    states = lock(question_ids)
+    missing = question_ids - set(states)
+    if missing:
+        ReviewState.objects.bulk_create(
+            [ReviewState(user=user, question_id=question_id, due_at=now) for question_id in missing],
+            ignore_conflicts=True
+        )
+        states.update(lock(missing))
+
+    for question, is_correct in graded:
+        state = states[question.id]
+        review(state, is_correct, now)
+        # bulk_update() does not apply auto_now
+        state.updated_at = now
+
+    ReviewState.objects.bulk_update(list(states.values()), REVIEW_FIELDS + ['updated_at'])
+    return states
@@ -1,19 +1,21 @@
 from rest_framework import serializers
 from .models import (
     PracticeActivity, UserProgress, PracticeQuestion,
-    InputTestQuestion, InputTestAttempt
+    InputTestQuestion, InputTestAttempt, ReviewState, ProgressRollup
 )
 from chapters.serializers import VocabularySerializer
 
 
 class PracticeQuestionSerializer(serializers.ModelSerializer):
     vocabulary = VocabularySerializer(read_only=True)
+    accepted_answers = serializers.ListField(child=serializers.CharField(), required=False)
 
     class Meta:
         model = PracticeQuestion
         fields = [
             'id', 'activity', 'vocabulary', 'question_text',
-            'correct_answer', 'options', 'created_at', 'updated_at'
+            'correct_answer', 'accepted_answers', 'options',
+            'created_at', 'updated_at'
         ]
 
 
@@ -28,11 +30,30 @@ class UserProgressSerializer(serializers.ModelSerializer):
 
 
 class InputTestQuestionSerializer(serializers.ModelSerializer):
+    accepted_answers = serializers.ListField(child=serializers.CharField(), required=False)
+
     class Meta:
         model = InputTestQuestion
         fields = [
             'id', 'chapter', 'book_name', 'chapter_number', 'question_type', 'question_text',
-            'correct_answer', 'hint', 'created_at', 'updated_at'
+            'correct_answer', 'accepted_answers', 'hint', 'created_at', 'updated_at'
+        ]
+        # Copied from the chapter on save
+        read_only_fields = ['book_name', 'chapter_number']
+
+
+class InputTestQuestionImportSerializer(serializers.ModelSerializer):
+    """
+    Per-row validation for bulk imports. The chapter and its denormalized
+    book_name/chapter_number are set once by the view for the whole batch.
+    """
+    accepted_answers = serializers.ListField(child=serializers.CharField(), required=False)
+
+    class Meta:
+        model = InputTestQuestion
+        fields = [
+            'question_type', 'question_text', 'correct_answer',
+            'accepted_answers', 'hint'
         ]
 
 
@@ -45,6 +66,33 @@ class InputTestAttemptSerializer(serializers.ModelSerializer):
         ]
 
 
+class ReviewStateSerializer(serializers.ModelSerializer):
+    question = InputTestQuestionSerializer(read_only=True)
+
+    class Meta:
+        model = ReviewState
+        fields = [
+            'id', 'question', 'ease', 'interval', 'repetitions',
+            'due_at', 'last_reviewed_at'
+        ]
+
+
+class ProgressRollupSerializer(serializers.ModelSerializer):
+    book_name = serializers.CharField(source='chapter.book_name', read_only=True)
+    chapter_number = serializers.IntegerField(source='chapter.chapter_number', read_only=True)
+    accuracy = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ProgressRollup
+        fields = [
+            'chapter', 'book_name', 'chapter_number', 'question_type',
+            'attempts', 'corrects', 'accuracy', 'last_attempt_at'
+        ]
+
+    def get_accuracy(self, obj):
+        return obj.corrects / obj.attempts if obj.attempts else None
+
+
 class PracticeActivitySerializer(serializers.ModelSerializer):
     questions = PracticeQuestionSerializer(many=True, read_only=True)
     progress = UserProgressSerializer(many=True, read_only=True)
@@ -0,0 +1,379 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.test import Client, SimpleTestCase, TestCase, TransactionTestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from chapters.models import Chapter, Vocabulary
+from .grading import AnswerGrader
+from .models import (
+    PracticeActivity, PracticeQuestion, UserProgress,
+    InputTestQuestion, InputTestAttempt
+)
+from .serializers import InputTestQuestionImportSerializer
+from .views import InputTestQuestionViewSet, InputTestAttemptViewSet
+
+
+class SubmitAnswerConcurrencyTest(TransactionTestCase):
+    """Concurrent correct answers from one user must all be counted."""
+
+    workers = 8
+    submissions = 40
+
+    def setUp(self):
+        self.user = User.objects.create_user('learner', password='secret')
+        chapter = Chapter.objects.create(
+            level='N5', book_name='Minna no Nihongo', chapter_number=1
+        )
+        vocabulary = Vocabulary.objects.create(
+            chapter=chapter, word='たべます 食べます', meaning='ăn'
+        )
+        self.activity = PracticeActivity.objects.create(
+            chapter=chapter, activity_type='typing', title='Typing'
+        )
+        self.question = PracticeQuestion.objects.create(
+            activity=self.activity,
+            vocabulary=vocabulary,
+            question_text='ăn',
+            correct_answer='たべます'
+        )
+
+    def submit(self, answer):
+        try:
+            client = Client()
+            client.force_login(self.user)
+            response = client.post(
+                f'/api/practice-activities/{self.activity.id}/submit_answer/',
+                {'question_id': self.question.id, 'answer': answer},
+                content_type='application/json',
+                HTTP_HOST='localhost'
+            )
+            return response.status_code, response.json()
+        finally:
+            # Each worker thread has its own connection
+            connection.close()
+
+    def test_no_lost_updates(self):
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            responses = list(pool.map(self.submit, ['タベマス'] * self.submissions))
+
+        self.assertTrue(all(status == 200 for status, _ in responses))
+        self.assertTrue(all(body['is_correct'] for _, body in responses))
+        # Every increment returned a distinct new score
+        self.assertEqual(
+            sorted(body['score'] for _, body in responses),
+            list(range(1, self.submissions + 1))
+        )
+        progress = UserProgress.objects.get(user=self.user, activity=self.activity)
+        self.assertEqual(progress.score, self.submissions)
+
+    def test_wrong_answer_keeps_score(self):
+        self.submit('たべます')
+        status, body = self.submit('のみます')
+
+        self.assertEqual(status, 200)
+        self.assertFalse(body['is_correct'])
+        self.assertEqual(body['score'], 1)
+
+
+class AccessPathIndexTest(TestCase):
+    """The list endpoints' querysets must be able to use their indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('learner', password='secret')
+        other = User.objects.create_user('other', password='secret')
+        questions = []
+        for number in range(1, 11):
+            chapter = Chapter.objects.create(
+                level='N5', book_name='Minna no Nihongo', chapter_number=number
+            )
+            for question_type, _ in InputTestQuestion.QUESTION_TYPES:
+                questions += [
+                    InputTestQuestion(
+                        chapter=chapter,
+                        book_name=chapter.book_name,
+                        chapter_number=number,
+                        question_type=question_type,
+                        question_text=f'{question_type} {number}-{index}',
+                        correct_answer='こたえ'
+                    )
+                    for index in range(10)
+                ]
+        questions = InputTestQuestion.objects.bulk_create(questions)
+        InputTestAttempt.objects.bulk_create(
+            InputTestAttempt(
+                user=user, question=question, user_answer='こたえ', is_correct=True
+            )
+            for question in questions
+            for user in (cls.user, other, None)
+        )
+
+    def setUp(self):
+        # The seeded tables are small enough for a sequential scan to win;
+        # make the planner show whether an index is usable at all
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def list_queryset(self, viewset_class, params):
+        request = Request(APIRequestFactory().get('/', params))
+        request.user = self.user
+        view = viewset_class(request=request, action='list', format_kwarg=None)
+        return view.filter_queryset(view.get_queryset())
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_questions_by_book_chapter_and_type(self):
+        queryset = self.list_queryset(InputTestQuestionViewSet, {
+            'book_name': 'Minna no Nihongo',
+            'chapter_number': 3,
+            'question_type': 'grammar',
+        })
+        self.assertEqual(queryset.count(), 10)
+        self.assertUsesIndex(queryset, 'inputtestq_book_chapter_idx')
+
+    def test_questions_by_chapter_and_type(self):
+        chapter = Chapter.objects.get(chapter_number=3)
+        queryset = self.list_queryset(InputTestQuestionViewSet, {
+            'chapter': chapter.id,
+            'question_type': 'kanji',
+        })
+        self.assertEqual(queryset.count(), 10)
+        self.assertUsesIndex(queryset, 'inputtestq_chapter_type_idx')
+
+    def test_own_attempts_newest_first(self):
+        queryset = self.list_queryset(InputTestAttemptViewSet, {})
+        self.assertEqual(queryset.count(), 300)
+        self.assertUsesIndex(queryset, 'inputtestattempt_user_recent')
+
+
+class ImportQuestionsTest(TestCase):
+    """Bad requests are rejected before any chapter is created."""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('editor', password='secret'))
+
+    def post(self, questions, **data):
+        return self.client.post('/api/input-test-questions/import_questions/', {
+            'book_name': 'Imported',
+            'chapter_number': 1,
+            'question_type': 'vocabulary',
+            'questions': questions,
+            **data,
+        }, content_type='application/json')
+
+    def test_invalid_level(self):
+        for level in ['N10', 'N9']:
+            with self.subTest(level=level):
+                response = self.post([{'question_text': 'ăn', 'correct_answer': 'たべる'}], level=level)
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(Chapter.objects.exists())
+
+    def test_no_valid_rows(self):
+        response = self.post([{'question_text': 'ăn'}, 'not a row'])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json()['errors']), 2)
+        self.assertFalse(Chapter.objects.exists())
+
+    def test_some_valid_rows(self):
+        response = self.post([{'question_text': 'ăn', 'correct_answer': 'たべる'}, {'question_text': 'ăn'}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], 1)
+        self.assertEqual(Chapter.objects.get().level, 'N5')
+
+
+class QuestionChapterFieldsSyncTest(TestCase):
+    """Chapter and question saves cost a sync only when something moved."""
+
+    @classmethod
+    def setUpTestData(cls):
+        chapter = Chapter.objects.create(level='N5', book_name='Book', chapter_number=1)
+        cls.other = Chapter.objects.create(level='N5', book_name='Book', chapter_number=2)
+        InputTestQuestion.objects.create(
+            chapter=chapter, question_type='vocabulary',
+            question_text='ăn', correct_answer='たべる'
+        )
+
+    def test_chapter_save_without_rename(self):
+        chapter = Chapter.objects.get(chapter_number=1)
+        chapter.level = 'N4'
+        with self.assertNumQueries(1):
+            chapter.save()
+
+    def test_chapter_rename(self):
+        chapter = Chapter.objects.get(chapter_number=1)
+        chapter.book_name = 'Renamed'
+        with self.assertNumQueries(2):
+            chapter.save()
+        self.assertEqual(InputTestQuestion.objects.get().book_name, 'Renamed')
+
+    def test_question_save_without_move(self):
+        question = InputTestQuestion.objects.get()
+        question.hint = 'verb'
+        with self.assertNumQueries(1):
+            question.save()
+
+    def test_question_move(self):
+        question = InputTestQuestion.objects.get()
+        question.chapter_id = self.other.id
+        question.save()
+        question = InputTestQuestion.objects.get()
+        self.assertEqual((question.book_name, question.chapter_number), ('Book', 2))
+
+
+class QuestionChapterFieldsRepairTest(TestCase):
+    """Both repair commands take the chapter FK as the source of truth."""
+
+    def setUp(self):
+        self.chapter = Chapter.objects.create(level='N5', book_name='Book', chapter_number=1)
+        self.other = Chapter.objects.create(level='N5', book_name='Book', chapter_number=2)
+        self.question = InputTestQuestion.objects.create(
+            chapter=self.chapter, question_type='vocabulary',
+            question_text='ăn', correct_answer='たべる'
+        )
+        # Drift the columns towards the other chapter, as a raw write would
+        InputTestQuestion.objects.update(chapter_number=2)
+
+    def run_commands(self, *commands):
+        for name, options in commands:
+            call_command(name, stdout=StringIO(), **options)
+        self.question.refresh_from_db()
+        return self.question.chapter_id, self.question.book_name, self.question.chapter_number
+
+    def test_same_result_in_either_order(self):
+        expected = (self.chapter.id, 'Book', 1)
+        with transaction.atomic():
+            self.assertEqual(self.run_commands(
+                ('fix_mismatched_questions', {}),
+                ('check_question_chapter_fields', {'fix': True}),
+            ), expected)
+            transaction.set_rollback(True)
+        self.assertEqual(self.run_commands(
+            ('check_question_chapter_fields', {'fix': True}),
+            ('fix_mismatched_questions', {}),
+        ), expected)
+
+    def test_check_warns_about_another_chapter(self):
+        output = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('check_question_chapter_fields', stdout=output)
+        self.assertIn('1 of them name another existing chapter', output.getvalue())
+
+    def test_repoint_from_columns(self):
+        self.assertEqual(self.run_commands(
+            ('fix_mismatched_questions', {'repoint_from_columns': True}),
+            ('check_question_chapter_fields', {}),
+        ), (self.other.id, 'Book', 2))
+
+    def test_question_type_by_chapter(self):
+        self.run_commands(('fix_mismatched_questions', {
+            'book_name': 'Book', 'chapter_number': 1, 'question_type': 'kanji',
+        }))
+        self.assertEqual(self.question.question_type, 'kanji')
+        self.assertEqual(self.question.chapter_number, 1)
+
+
+class SubmitAnswersValidationTest(TestCase):
+    """One malformed answer is reported without failing the session."""
+
+    @classmethod
+    def setUpTestData(cls):
+        chapter = Chapter.objects.create(level='N5', book_name='Book', chapter_number=1)
+        cls.question = InputTestQuestion.objects.create(
+            chapter=chapter, question_type='vocabulary',
+            question_text='ăn', correct_answer='たべる'
+        )
+
+    def post(self, path, data):
+        return self.client.post(path, data, content_type='application/json')
+
+    def test_session_with_bad_answers(self):
+        response = self.post('/api/input-test-questions/submit_answers/', {'answers': [
+            {'question_id': self.question.id, 'answer': 5},
+            {'question_id': self.question.id, 'answer': 'た' * 201},
+            {'question_id': self.question.id, 'answer': 'たべる'},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([result.get('error') for result in results], [
+            'Answer must be a string.',
+            'Answer is longer than 200 characters.',
+            None,
+        ])
+        self.assertTrue(results[2]['is_correct'])
+        self.assertEqual(InputTestAttempt.objects.count(), 1)
+
+    def test_single_bad_answer(self):
+        for answer in [5, ['たべる'], 'た' * 201]:
+            with self.subTest(answer=answer):
+                response = self.post(
+                    f'/api/input-test-questions/{self.question.id}/submit_answer/', {'answer': answer}
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(InputTestAttempt.objects.exists())
+
+
+class AnswerGraderTest(SimpleTestCase):
+    """Spelling variants are accepted; different words are not."""
+
+    def setUp(self):
+        self.grader = AnswerGrader()
+
+    def grade(self, correct_answer, answer, accepted_answers=()):
+        question = InputTestQuestion(
+            pk=1, correct_answer=correct_answer, accepted_answers=accepted_answers
+        )
+        self.grader.clear()
+        return self.grader.grade(question, answer)
+
+    def test_kana_and_width_variants(self):
+        self.assertTrue(self.grade('たべます', 'タベマス'))
+        self.assertTrue(self.grade('たべます', ' たべます。'))
+
+    def test_okurigana_between_kanji(self):
+        self.assertTrue(self.grade('取り扱い', '取扱い'))
+        self.assertTrue(self.grade('申込み', '申し込み'))
+
+    def test_different_verbs_are_wrong(self):
+        for correct_answer, answer in [
+            ('見る', '見せる'),
+            ('上がる', '上げる'),
+            ('始まる', '始める'),
+            ('教えます', '教わります'),
+            ('開く', '開ける'),
+        ]:
+            with self.subTest(correct_answer=correct_answer, answer=answer):
+                self.assertFalse(self.grade(correct_answer, answer))
+                self.assertFalse(self.grade(answer, correct_answer))
+
+    def test_accepted_answers(self):
+        self.assertTrue(self.grade('行う', '行なう', ['行なう']))
+        self.assertFalse(self.grade('行う', '行なう'))
+
+    def test_malformed_accepted_answers_are_ignored(self):
+        self.assertFalse(self.grade('たべる', 'た', 'たべる'))
+        self.assertTrue(self.grade('たべる', 'たべる', [1, None, {'a': 1}]))
+        self.assertFalse(self.grade('たべる', '1', [1]))
+
+    def validate_import(self, accepted_answers):
+        serializer = InputTestQuestionImportSerializer(data={
+            'question_type': 'vocabulary',
+            'question_text': 'ăn',
+            'correct_answer': 'たべる',
+            'accepted_answers': accepted_answers,
+        })
+        serializer.is_valid()
+        return serializer
+
+    def test_import_validates_accepted_answers(self):
+        for accepted_answers in ['たべる', [['たべる']], [None]]:
+            with self.subTest(accepted_answers=accepted_answers):
+                self.assertIn('accepted_answers', self.validate_import(accepted_answers).errors)
+        # Numbers are stored as strings
+        self.assertEqual(self.validate_import([1]).validated_data['accepted_answers'], ['1'])
@@ -1,17 +1,43 @@
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
 from rest_framework import viewsets, filters, status
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from chapters.models import Chapter
+from common import constant
+from common.pagination import SelectablePaginationMixin
 from .models import (
     PracticeActivity, UserProgress, PracticeQuestion,
-    InputTestQuestion, InputTestAttempt
+    InputTestQuestion, InputTestAttempt, ReviewState, ProgressRollup
 )
+from .scheduling import record_review, record_reviews
 from .serializers import (
     PracticeActivitySerializer, UserProgressSerializer,
     PracticeQuestionSerializer, InputTestQuestionSerializer,
-    InputTestAttemptSerializer
+    InputTestAttemptSerializer, InputTestQuestionImportSerializer,
+    ReviewStateSerializer, ProgressRollupSerializer
 )
 
+IMPORT_BATCH_SIZE = 500
+MAX_IMPORT_BATCH_SIZE = 5000
+MAX_SUBMITTED_ANSWERS = 500
+MAX_ANSWER_LENGTH = InputTestAttempt._meta.get_field('user_answer').max_length
+
+
+def answer_error(answer):
+    """Why ``answer`` cannot be graded and stored as an attempt, or None."""
+    if not answer:
+        return 'No answer provided.'
+    if not isinstance(answer, str):
+        return 'Answer must be a string.'
+    if len(answer) > MAX_ANSWER_LENGTH:
+        return f'Answer is longer than {MAX_ANSWER_LENGTH} characters.'
+    return None
+
 
 class PracticeActivityViewSet(viewsets.ModelViewSet):
     queryset = PracticeActivity.objects.all()
@@ -25,6 +51,17 @@ class PracticeActivityViewSet(viewsets.ModelViewSet):
     search_fields = ['title', 'description']
     ordering_fields = ['created_at']
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'submit_answer':
+            return queryset
+        # Nested questions (with their vocabulary) and progress, in two
+        # prefetch queries for any number of activities
+        return queryset.prefetch_related(
+            Prefetch('questions', queryset=PracticeQuestion.objects.select_related('vocabulary')),
+            'progress',
+        )
+
     @action(detail=True, methods=['post'])
     def submit_answer(self, request, pk=None):
         activity = self.get_object()
@@ -37,22 +74,18 @@ class PracticeActivityViewSet(viewsets.ModelViewSet):
                 activity=activity
             )
             is_correct = question.check_answer(user_answer)
-            
-            # Update user progress
-            progress, created = UserProgress.objects.get_or_create(
-                user=request.user,
-                activity=activity,
-                defaults={'score': 0}
-            )
-            
-            if is_correct:
-                progress.score += 1
-                progress.save()
-            
+
+            # Update user progress in one atomic upsert
+            score = None
+            if request.user.is_authenticated:
+                score = UserProgress.add_score(
+                    request.user, activity, 1 if is_correct else 0
+                )
+
             return Response({
                 'is_correct': is_correct,
                 'correct_answer': question.correct_answer,
-                'score': progress.score
+                'score': score
             })
         except PracticeQuestion.DoesNotExist:
             return Response(
@@ -61,19 +94,31 @@ class PracticeActivityViewSet(viewsets.ModelViewSet):
             )
 
 
-class InputTestQuestionViewSet(viewsets.ModelViewSet):
+class InputTestQuestionViewSet(SelectablePaginationMixin, viewsets.ModelViewSet):
     queryset = InputTestQuestion.objects.all()
+    cursor_ordering = ('created_at', 'id')
     serializer_class = InputTestQuestionSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ['chapter', 'question_type']
+    filterset_fields = ['chapter', 'book_name', 'chapter_number', 'question_type']
     ordering_fields = ['created_at']
 
     @action(detail=False, methods=['POST'])
     def import_questions(self, request):
+        """
+        Bulk import questions into one chapter.
+
+        All rows are validated in a single pass and the valid ones are
+        inserted with ``bulk_create`` in batches of ``batch_size``. Invalid
+        rows are reported by their index in ``questions``. With
+        ``atomic=true`` nothing is imported unless every row is valid;
+        without a valid row the chapter is not created either.
+        """
         questions_data = request.data.get('questions', [])
         book_name = request.data.get('book_name')
         chapter_number = request.data.get('chapter_number')
         question_type = request.data.get('question_type')
+        level = request.data.get('level', 'N5')
+        atomic = str(request.data.get('atomic', '')).lower() in ('1', 'true')
 
         if not questions_data or not book_name or not chapter_number or not question_type:
             return Response(
@@ -85,86 +130,204 @@ class InputTestQuestionViewSet(viewsets.ModelViewSet):
                 },
                 status=status.HTTP_400_BAD_REQUEST
             )
-
+        if not isinstance(questions_data, list):
+            return Response(
+                {'error': 'questions must be a list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if level not in dict(constant.LEVEL_CHOICES):
+            return Response(
+                {'error': f'Invalid level: {level}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         try:
-            # Get or create the chapter
-            from chapters.models import Chapter
-            chapter, created = Chapter.objects.get_or_create(
-                book_name=book_name,
-                chapter_number=chapter_number,
-                defaults={
-                    'title': f'Chapter {chapter_number}',
-                    'level': 'N5'  # Default level
-                }
+            chapter_number = int(chapter_number)
+            batch_size = int(request.data.get('batch_size', IMPORT_BATCH_SIZE))
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'chapter_number and batch_size must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
             )
+        batch_size = min(max(batch_size, 1), MAX_IMPORT_BATCH_SIZE)
 
-            created_questions = []
-            errors = []
-
-            for question_data in questions_data:
-                try:
-                    # Use question_type from question_data if present, else fallback
-                    q_type = question_data.get('question_type', question_type)
-                    question_data['chapter'] = chapter.id
-                    question_data['question_type'] = q_type
-                    question_data['book_name'] = book_name
-                    question_data['chapter_number'] = chapter_number
-
-                    serializer = self.get_serializer(data=question_data)
-                    if not serializer.is_valid():
-                        print('Validation error:', serializer.errors)
-                    serializer.is_valid(raise_exception=True)
-                    serializer.save()
-                    created_questions.append(serializer.data)
-                except Exception as e:
-                    print('Exception:', str(e))
-                    errors.append({
-                        'question': question_data,
-                        'error': str(e)
-                    })
+        # One validation pass over the payload; no queries are issued here
+        validator = InputTestQuestionImportSerializer()
+        valid_rows = []
+        errors = []
+        for index, question_data in enumerate(questions_data):
+            if isinstance(question_data, dict):
+                question_data = {'question_type': question_type, **question_data}
+            try:
+                valid_rows.append(validator.run_validation(question_data))
+            except ValidationError as e:
+                errors.append({
+                    'index': index,
+                    'question': question_data,
+                    'error': e.detail
+                })
 
-            return Response({
-                'created': len(created_questions),
-                'created_questions': created_questions,
-                'errors': errors,
-                'message': (
-                    f'Successfully imported {len(created_questions)} questions '
-                    f'to {book_name} Chapter {chapter_number}. '
-                    f'{len(errors)} errors.'
-                )
-            })
-        except Exception as e:
+        # Without a valid row there is nothing to import, and no chapter to create
+        if errors and (atomic or not valid_rows):
             return Response(
-                {'error': f'Failed to process import: {str(e)}'},
+                {
+                    'created': 0,
+                    'errors': errors,
+                    'message': (
+                        f'Nothing imported: {len(errors)} of '
+                        f'{len(questions_data)} questions are invalid.'
+                    )
+                },
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        with transaction.atomic():
+            chapter, _ = Chapter.objects.get_or_create(
+                book_name=book_name,
+                chapter_number=chapter_number,
+                defaults={'level': level}
+            )
+            questions = [
+                InputTestQuestion(
+                    chapter=chapter,
+                    book_name=book_name,
+                    chapter_number=chapter_number,
+                    **row
+                )
+                for row in valid_rows
+            ]
+            created_questions = InputTestQuestion.objects.bulk_create(
+                questions, batch_size=batch_size
+            )
+
+        return Response({
+            'created': len(created_questions),
+            'created_questions': self.get_serializer(
+                created_questions, many=True
+            ).data,
+            'errors': errors,
+            'message': (
+                f'Successfully imported {len(created_questions)} questions '
+                f'to {book_name} Chapter {chapter_number}. '
+                f'{len(errors)} errors.'
+            )
+        })
+
     @action(detail=True, methods=['post'])
     def submit_answer(self, request, pk=None):
         question = self.get_object()
         user_answer = request.data.get('answer')
 
-        if not user_answer:
-            return Response({'error': 'No answer provided.'}, status=400)
+        error = answer_error(user_answer)
+        if error:
+            return Response({'error': error}, status=400)
 
-        is_correct = question.correct_answer.lower() == user_answer.lower()
+        is_correct = question.check_answer(user_answer)
         user = request.user if request.user.is_authenticated else None
-        # Record the attempt
-        attempt = InputTestAttempt.objects.create(
-            user=user,
-            question=question,
-            user_answer=user_answer,
-            is_correct=is_correct
-        )
+        review_state = None
+        with transaction.atomic():
+            # Record the attempt
+            attempt = InputTestAttempt.objects.create(
+                user=user,
+                question=question,
+                user_answer=user_answer,
+                is_correct=is_correct
+            )
+            if user is not None:
+                review_state = record_review(user, question, is_correct)
+                ProgressRollup.record(user, [(question, is_correct)])
         return Response({
             'is_correct': is_correct,
             'correct_answer': question.correct_answer,
-            'attempt_id': attempt.id
+            'attempt_id': attempt.id,
+            'next_review_at': review_state.due_at if review_state else None
         })
 
+    @action(detail=False, methods=['post'])
+    def submit_answers(self, request):
+        """
+        Grade a whole practice session in one request.
+
+        Expects ``answers``: a list of ``{question_id, answer}``. Questions
+        are loaded with one ``in_bulk`` query, graded in memory and the
+        attempts are written with one ``bulk_create``. Returns per-answer
+        results (in request order) and the session score.
+        """
+        answers = request.data.get('answers')
+        if not answers or not isinstance(answers, list):
+            return Response(
+                {'error': 'answers must be a non-empty list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(answers) > MAX_SUBMITTED_ANSWERS:
+            return Response(
+                {'error': f'At most {MAX_SUBMITTED_ANSWERS} answers per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        question_ids = set()
+        for answer in answers:
+            try:
+                question_ids.add(int(answer['question_id']))
+            except (KeyError, TypeError, ValueError):
+                continue
+        questions = InputTestQuestion.objects.in_bulk(question_ids)
+
+        user = request.user if request.user.is_authenticated else None
+        results = []
+        attempts = []
+        graded = []
+        for index, answer in enumerate(answers):
+            try:
+                question = questions.get(int(answer['question_id']))
+            except (KeyError, TypeError, ValueError):
+                question = None
+            user_answer = answer.get('answer') if isinstance(answer, dict) else None
+            if question is None:
+                results.append({'index': index, 'error': 'Question not found.'})
+                continue
+            error = answer_error(user_answer)
+            if error:
+                results.append({
+                    'index': index,
+                    'question_id': question.id,
+                    'error': error
+                })
+                continue
 
-class InputTestAttemptViewSet(viewsets.ReadOnlyModelViewSet):
+            is_correct = question.check_answer(user_answer)
+            attempts.append(InputTestAttempt(
+                user=user,
+                question=question,
+                user_answer=user_answer,
+                is_correct=is_correct
+            ))
+            graded.append((question, is_correct))
+            results.append({
+                'index': index,
+                'question_id': question.id,
+                'is_correct': is_correct,
+                'correct_answer': question.correct_answer
+            })
+
+        with transaction.atomic():
+            InputTestAttempt.objects.bulk_create(attempts)
+            if user is not None and graded:
+                record_reviews(user, graded)
+                ProgressRollup.record(user, graded)
+
+        score = sum(1 for _, is_correct in graded if is_correct)
+        return Response({
+            'results': results,
+            'score': score,
+            'total': len(graded),
+            'errors': len(results) - len(graded)
+        })
+
+
+class InputTestAttemptViewSet(SelectablePaginationMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = InputTestAttemptSerializer
+    # Attempt history only grows; long histories should be walked with
+    # ?pagination=cursor (newest first, no COUNT)
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['user', 'question', 'is_correct']
     ordering_fields = ['created_at']
@@ -173,6 +336,25 @@ class InputTestAttemptViewSet(viewsets.ReadOnlyModelViewSet):
         return InputTestAttempt.objects.filter(user=self.request.user)
 
 
+class ReviewQueueViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Questions due for review for the current user, most overdue first.
+    A single range scan on the (user, due_at) index.
+    """
+    serializer_class = ReviewStateSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['question__question_type', 'question__chapter']
+
+    def get_queryset(self):
+        return (
+            ReviewState.objects
+            .filter(user=self.request.user, due_at__lte=timezone.now())
+            .select_related('question')
+            .order_by('due_at')
+        )
+
+
 class UserProgressViewSet(viewsets.ModelViewSet):
     serializer_class = UserProgressSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
@@ -184,7 +366,7 @@ class UserProgressViewSet(viewsets.ModelViewSet):
 
 
 class PracticeQuestionViewSet(viewsets.ModelViewSet):
-    queryset = PracticeQuestion.objects.all()
+    queryset = PracticeQuestion.objects.select_related('vocabulary')
     serializer_class = PracticeQuestionSerializer
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['activity', 'vocabulary']
@@ -198,4 +380,28 @@ class VocabularyInputTestQuestionViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['created_at']
 
     def get_queryset(self):
-        return InputTestQuestion.objects.filter(question_type='vocabulary') 
\ No newline at end of file
+        return InputTestQuestion.objects.filter(question_type='vocabulary')
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def progress_summary(request):
+    """
+    Accuracy per chapter and question type for the current user, read from
+    the ProgressRollup table only (one query).
+    """
+    rollups = (
+        ProgressRollup.objects
+        .filter(user=request.user)
+        .select_related('chapter')
+        .order_by('chapter__book_name', 'chapter__chapter_number', 'question_type')
+    )
+    data = ProgressRollupSerializer(rollups, many=True).data
+    attempts = sum(row['attempts'] for row in data)
+    corrects = sum(row['corrects'] for row in data)
+    return Response({
+        'attempts': attempts,
+        'corrects': corrects,
+        'accuracy': corrects / attempts if attempts else None,
+        'chapters': data,
+    })
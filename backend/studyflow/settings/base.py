@@ -14,6 +14,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # Third party apps
     'rest_framework',
     'corsheaders',
@@ -25,6 +26,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so its latency covers the other middleware too
+    'common.middleware.MetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -36,6 +39,10 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'studyflow.urls'
 
+# Serve search, decks and chapter detail from async views (chapters.async_views).
+# studyflow/asgi.py turns this on; the WSGI stack keeps the sync views.
+ASYNC_VIEWS = os.environ.get('DJANGO_ASYNC_VIEWS', '0') == '1'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -56,12 +63,25 @@ WSGI_APPLICATION = 'studyflow.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        # django.db.backends.postgresql plus connection counters (/db/pool/)
+        'ENGINE': 'common.backends.postgresql',
         'NAME': os.environ.get('POSTGRES_DB', 'studyflow'),
         'USER': os.environ.get('POSTGRES_USER', 'studyflow'),
         'PASSWORD': os.environ.get('POSTGRES_PASSWORD', 'studyflow'),
         'HOST': os.environ.get('POSTGRES_HOST', 'db'),
         'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        # Keep each worker thread's connection for this many seconds and ping
+        # it before reuse. Persistent connections are per thread, which the
+        # async stack does not pin requests to, so it reconnects per request.
+        'CONN_MAX_AGE': int(os.environ.get(
+            'POSTGRES_CONN_MAX_AGE', '0' if ASYNC_VIEWS else '60'
+        )),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Lets /db/pool/ find this app's sessions in pg_stat_activity
+            'application_name': 'studyflow',
+            'connect_timeout': 5,
+        },
     }
 }
 
@@ -90,10 +110,34 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Local-memory cache is per process; production uses a shared file cache so
+# every worker sees the response cache invalidations (see common.cache)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+# Clients allowed to read the internal stats endpoints besides staff users
+INTERNAL_IPS = os.environ.get('DJANGO_INTERNAL_IPS', '127.0.0.1 ::1').split()
+
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 300  # seconds
+
 # REST Framework settings
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'common.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # orjson when installed, stdlib json otherwise
+    'DEFAULT_RENDERER_CLASSES': [
+        'common.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'common.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
@@ -0,0 +1,368 @@
+from collections import namedtuple
+from datetime import timedelta
+from urllib.parse import quote, unquote
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+
+from chapters.models import Chapter, Vocabulary, GrammarPattern, GrammarUsage, GrammarExample, Note
+from practice.models import (
+    PracticeActivity, PracticeQuestion, UserProgress,
+    InputTestQuestion, InputTestAttempt, ReviewState, ProgressRollup
+)
+from .urls import router
+
+# One API call and the most queries it may issue. ``path`` and ``data`` are
+# formatted with QueryBudgetTest.ids; ``view`` is the URL name it resolves to.
+Route = namedtuple('Route', 'view method path data budget', defaults=(None, None))
+
+# Lists ask for one page holding the whole dataset, so an N+1 grows with it
+PAGE = 'page_size=1000'
+
+# Session and user lookups of the logged-in client, and the savepoints that
+# atomic blocks issue only because the test itself runs in a transaction
+IGNORED_SQL = ('"django_session"', '"auth_user"', 'SAVEPOINT')
+
+ROUTES = [
+    Route('book-list', 'get', '/api/books/', budget=2),
+    Route('book-detail', 'get', '/api/books/{book}/', budget=2),
+    Route('chapter-list', 'get', f'/api/chapters/?{PAGE}', budget=3),
+    Route('chapter-detail', 'get', '/api/chapters/{chapter}/', budget=6),
+    Route('vocabulary-list', 'get', f'/api/vocabularies/?pagination=page&{PAGE}', budget=3),
+    Route('vocabulary-detail', 'get', '/api/vocabularies/{vocabulary}/', budget=2),
+    Route('vocabulary-import-file', 'post', '/api/vocabularies/import/', data={
+        'book_name': 'Imported',
+        'chapter_number': 1,
+        'file': 'word,meaning\nあさ,morning\nひる,noon\nよる,evening\n',
+    }, budget=4),
+    Route('grammarpattern-list', 'get', f'/api/grammar_patterns/?{PAGE}', budget=5),
+    Route('grammarpattern-detail', 'get', '/api/grammar_patterns/{pattern}/', budget=4),
+    Route('note-list', 'get', f'/api/notes/?{PAGE}', budget=2),
+    Route('note-detail', 'get', '/api/notes/{note}/', budget=1),
+    Route('practiceactivity-list', 'get', f'/api/practice-activities/?{PAGE}', budget=4),
+    Route('practiceactivity-detail', 'get', '/api/practice-activities/{activity}/', budget=3),
+    Route('practiceactivity-submit-answer', 'post', '/api/practice-activities/{activity}/submit_answer/', data={
+        'question_id': '{practice_question}', 'answer': 'こたえ',
+    }, budget=3),
+    Route('practicequestion-list', 'get', f'/api/practice-questions/?{PAGE}', budget=2),
+    Route('practicequestion-detail', 'get', '/api/practice-questions/{practice_question}/', budget=1),
+    Route('user-progress-list', 'get', f'/api/user-progress/?{PAGE}', budget=2),
+    Route('user-progress-detail', 'get', '/api/user-progress/{progress}/', budget=1),
+    Route('inputtestquestion-list', 'get', f'/api/input-test-questions/?pagination=page&{PAGE}', budget=2),
+    Route('inputtestquestion-detail', 'get', '/api/input-test-questions/{question}/', budget=1),
+    Route('inputtestquestion-import-questions', 'post', '/api/input-test-questions/import_questions/', data={
+        'book_name': 'Imported',
+        'chapter_number': 2,
+        'question_type': 'vocabulary',
+        'questions': [
+            {'question_text': f'question {index}', 'correct_answer': 'こたえ'}
+            for index in range(5)
+        ],
+    }, budget=3),
+    Route('inputtestquestion-submit-answer', 'post', '/api/input-test-questions/{question}/submit_answer/', data={
+        'answer': 'こたえ',
+    }, budget=5),
+    Route('inputtestquestion-submit-answers', 'post', '/api/input-test-questions/submit_answers/', data={
+        'answers': [
+            {'question_id': '{question}', 'answer': 'こたえ'},
+            {'question_id': '{other_question}', 'answer': 'ちがう'},
+        ],
+    }, budget=5),
+    Route('input-test-attempt-list', 'get', f'/api/input-test-attempts/?pagination=page&{PAGE}', budget=2),
+    Route('input-test-attempt-detail', 'get', '/api/input-test-attempts/{attempt}/', budget=1),
+    Route('vocabulary-input-test-question-list', 'get', f'/api/vocabulary-input-test-questions/?{PAGE}', budget=2),
+    Route('vocabulary-input-test-question-detail', 'get', '/api/vocabulary-input-test-questions/{question}/', budget=1),
+    Route('review-queue-list', 'get', f'/api/review-queue/?{PAGE}', budget=2),
+    Route('review-queue-detail', 'get', '/api/review-queue/{review}/', budget=1),
+    Route('progress-summary', 'get', '/api/progress/summary/', budget=1),
+    Route('search', 'get', '/api/search/?q=ことば', budget=3),
+    Route('decks', 'get', '/api/decks/?chapters={chapters}&type=vocabulary', budget=1),
+    Route('decks', 'get', '/api/decks/?chapters={chapters}&type=grammar', budget=3),
+]
+
+
+class QueryBudgetTest(TestCase):
+    """
+    Every API route against a declared maximum number of queries, measured
+    on a seeded catalog and again after doubling it. A route whose count
+    grows with the data has an N+1 and fails even within its budget.
+    """
+    chapters_per_batch = 4
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('learner', password='secret')
+        cls.other = User.objects.create_user('other', password='secret')
+        cls.batches = 0
+        cls.ids = cls.seed()
+
+    @classmethod
+    def seed(cls):
+        """
+        Add one batch of chapters with their whole tree, practice data and
+        history for both users. Returns ids of objects from this batch.
+        """
+        cls.batches += 1
+        book_name = f'Book {cls.batches}'
+        now = timezone.now()
+        chapters = Chapter.objects.bulk_create(
+            Chapter(level='N5', book_name=book_name, chapter_number=number)
+            for number in range(1, cls.chapters_per_batch + 1)
+        )
+        ids = {
+            'book': quote(book_name),
+            'chapters': ','.join(str(chapter.id) for chapter in chapters),
+        }
+
+        for chapter in chapters:
+            vocabularies = []
+            for index in range(5):
+                vocabulary = Vocabulary(
+                    chapter=chapter, word=f'ことば{index}', meaning=f'word {index}'
+                )
+                vocabulary.update_search_keys()
+                vocabularies.append(vocabulary)
+            Vocabulary.objects.bulk_create(vocabularies)
+
+            for index in range(3):
+                pattern = GrammarPattern.objects.create(
+                    chapter=chapter, pattern=f'～ている{index}'
+                )
+                for order in range(2):
+                    usage = GrammarUsage.objects.create(
+                        pattern=pattern, explanation='Ongoing action', order=order
+                    )
+                    GrammarExample.objects.bulk_create(
+                        GrammarExample(
+                            usage=usage, sentence='たべている', translation='eating', order=order
+                        )
+                        for order in range(2)
+                    )
+
+            activity = PracticeActivity.objects.create(
+                chapter=chapter, activity_type='typing', title='Typing'
+            )
+            practice_questions = PracticeQuestion.objects.bulk_create(
+                PracticeQuestion(
+                    activity=activity,
+                    vocabulary=vocabulary,
+                    question_text=vocabulary.meaning,
+                    correct_answer='こたえ'
+                )
+                for vocabulary in vocabularies
+            )
+            progress = UserProgress.objects.bulk_create(
+                UserProgress(user=user, activity=activity, score=1)
+                for user in (cls.user, cls.other)
+            )
+
+            questions = InputTestQuestion.objects.bulk_create(
+                InputTestQuestion(
+                    chapter=chapter,
+                    book_name=book_name,
+                    chapter_number=chapter.chapter_number,
+                    question_type=question_type,
+                    question_text=f'{question_type} {index}',
+                    correct_answer='こたえ'
+                )
+                for question_type, _ in InputTestQuestion.QUESTION_TYPES
+                for index in range(2)
+            )
+            attempts = InputTestAttempt.objects.bulk_create(
+                InputTestAttempt(
+                    user=user, question=question, user_answer='こたえ', is_correct=True
+                )
+                for question in questions
+                for user in (cls.user, cls.other, None)
+            )
+            reviews = ReviewState.objects.bulk_create(
+                ReviewState(user=user, question=question, due_at=now - timedelta(days=1))
+                for question in questions
+                for user in (cls.user, cls.other)
+            )
+            ProgressRollup.objects.bulk_create(
+                ProgressRollup(
+                    user=user, chapter=chapter, question_type=question_type,
+                    attempts=2, corrects=2, last_attempt_at=now
+                )
+                for question_type, _ in InputTestQuestion.QUESTION_TYPES
+                for user in (cls.user, cls.other)
+            )
+
+        notes = Note.objects.bulk_create(
+            Note(title=f'ことば {index}', content='note') for index in range(5)
+        )
+        ids.update({
+            'chapter': chapter.id,
+            'vocabulary': vocabularies[0].id,
+            'pattern': pattern.id,
+            'note': notes[0].id,
+            'activity': activity.id,
+            'practice_question': practice_questions[0].id,
+            'progress': progress[0].id,
+            'question': questions[0].id,
+            'other_question': questions[1].id,
+            'attempt': attempts[0].id,
+            'review': reviews[0].id,
+        })
+        return ids
+
+    def setUp(self):
+        # Response cache hits issue no queries; the budgets are for misses
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        self.client.force_login(self.user)
+
+    def fill(self, value):
+        if isinstance(value, str):
+            return value.format(**self.ids)
+        if isinstance(value, list):
+            return [self.fill(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.fill(item) for key, item in value.items()}
+        return value
+
+    def request(self, route):
+        data = self.fill(route.data)
+        if route.view == 'vocabulary-import-file':
+            data['file'] = SimpleUploadedFile('words.csv', data['file'].encode())
+            kwargs = {'data': data}
+        elif data is not None:
+            kwargs = {'data': data, 'content_type': 'application/json'}
+        else:
+            kwargs = {}
+        return getattr(self.client, route.method)(self.fill(route.path), **kwargs)
+
+    def count_queries(self, route):
+        """
+        SQL of ``route`` without the session and user lookups. Writes are
+        rolled back, so each measurement starts from the same data.
+        """
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as context:
+                response = self.request(route)
+            transaction.set_rollback(True)
+        self.assertLess(response.status_code, 300, f'{route.path}: {response.content[:500]}')
+        return [
+            query['sql'] for query in context.captured_queries
+            if not any(skip in query['sql'] for skip in IGNORED_SQL)
+        ]
+
+    def test_every_route_has_a_budget(self):
+        views = {route.view for route in ROUTES}
+        for name in {url.name for url in router.urls} - {'api-root'}:
+            self.assertIn(name, views, f'{name} has no query budget')
+        for route in ROUTES:
+            self.assertEqual(resolve(unquote(self.fill(route.path).split('?')[0])).view_name, route.view)
+
+    def test_query_counts_within_budget_and_flat(self):
+        baseline = [len(self.count_queries(route)) for route in ROUTES]
+        self.seed()  # doubles the dataset
+        for route, expected in zip(ROUTES, baseline):
+            with self.subTest(route.view, path=route.path):
+                queries = self.count_queries(route)
+                self.assertLessEqual(
+                    len(queries), route.budget, 'over budget:\n' + '\n'.join(queries)
+                )
+                self.assertEqual(
+                    len(queries), expected, 'grows with the dataset:\n' + '\n'.join(queries)
+                )
+
+
+class ChapterSignalsTest(TestCase):
+    """Child writes keep their chapters' validators and caches current."""
+
+    def setUp(self):
+        self.first = Chapter.objects.create(level='N5', book_name='Book', chapter_number=1)
+        self.second = Chapter.objects.create(level='N5', book_name='Book', chapter_number=2)
+
+    def updated_at(self, chapter):
+        return Chapter.objects.values_list('updated_at', flat=True).get(pk=chapter.pk)
+
+    def test_move_touches_both_chapters(self):
+        Vocabulary.objects.create(chapter=self.first, word='あさ', meaning='morning')
+        vocabulary = Vocabulary.objects.get()
+        before = self.updated_at(self.first), self.updated_at(self.second)
+
+        vocabulary.chapter = self.second
+        vocabulary.save()
+
+        self.assertGreater(self.updated_at(self.first), before[0])
+        self.assertGreater(self.updated_at(self.second), before[1])
+        self.assertEqual(vocabulary.loaded_chapter_id, self.second.pk)
+
+    def test_chapter_delete_is_not_per_row(self):
+        def fill(chapter, size):
+            Vocabulary.objects.bulk_create(
+                Vocabulary(chapter=chapter, word=f'ことば{index}', meaning='word')
+                for index in range(size)
+            )
+            for index in range(size):
+                pattern = GrammarPattern.objects.create(chapter=chapter, pattern=f'～ている{index}')
+                usage = GrammarUsage.objects.create(pattern=pattern, explanation='usage')
+                GrammarExample.objects.create(usage=usage, sentence='たべている', translation='eating')
+
+        def delete_queries(chapter):
+            with CaptureQueriesContext(connection) as context:
+                chapter.delete()
+            return len(context.captured_queries)
+
+        fill(self.first, 2)
+        fill(self.second, 10)
+        self.assertEqual(delete_queries(self.first), delete_queries(self.second))
+
+
+class ConditionalGetTest(TestCase):
+    """Lists are validated by ETag only; details also get Last-Modified."""
+
+    def setUp(self):
+        self.first = Chapter.objects.create(level='N5', book_name='Book', chapter_number=1)
+        self.second = Chapter.objects.create(level='N5', book_name='Book', chapter_number=2)
+
+    def test_list_has_no_last_modified(self):
+        response = self.client.get('/api/chapters/')
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+        # Deleting an older row leaves MAX(updated_at) unchanged
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.delete()
+        response = self.client.get('/api/chapters/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_has_last_modified(self):
+        response = self.client.get(f'/api/chapters/{self.first.pk}/')
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_book_detail_has_no_last_modified(self):
+        response = self.client.get('/api/books/Book/')
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+
+class VocabularyImportTest(TestCase):
+    """Files that cannot be read are rejected with a 400 and import nothing."""
+
+    def upload(self, name, content):
+        return self.client.post('/api/vocabularies/import/', {
+            'book_name': 'Imported',
+            'file': SimpleUploadedFile(name, content),
+        })
+
+    def test_csv_in_another_encoding(self):
+        response = self.upload('words.csv', 'word,meaning\n朝,morning\n'.encode('shift_jis'))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('UTF-8', response.json()['error'])
+        self.assertFalse(Chapter.objects.exists())
+
+    def test_not_a_workbook(self):
+        response = self.upload('words.xlsx', b'word,meaning\n')
+        self.assertEqual(response.status_code, 400)
@@ -1,20 +1,25 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from chapters.views import ChapterViewSet, VocabularyViewSet, GrammarPatternViewSet, NoteViewSet
+from chapters import async_views
+from chapters.views import BookViewSet, ChapterViewSet, VocabularyViewSet, GrammarPatternViewSet, NoteViewSet, search, decks
 from practice.views import (
     PracticeActivityViewSet,
     PracticeQuestionViewSet,
     UserProgressViewSet,
     InputTestQuestionViewSet,
     InputTestAttemptViewSet,
-    VocabularyInputTestQuestionViewSet
+    VocabularyInputTestQuestionViewSet,
+    ReviewQueueViewSet,
+    progress_summary
 )
-from .views import health_check
+from .views import health_check, cache_stats, db_pool, metrics
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.http import JsonResponse
 
 router = DefaultRouter()
+router.register(r'books', BookViewSet, basename='book')
 router.register(r'chapters', ChapterViewSet)
 router.register(r'vocabularies', VocabularyViewSet)
 router.register(r'grammar_patterns', GrammarPatternViewSet)
@@ -25,6 +30,7 @@ router.register(r'input-test-questions', InputTestQuestionViewSet)
 router.register(r'input-test-attempts', InputTestAttemptViewSet, basename='input-test-attempt')
 router.register(r'vocabulary-input-test-questions', VocabularyInputTestQuestionViewSet, basename='vocabulary-input-test-question')
 router.register(r'notes', NoteViewSet)
+router.register(r'review-queue', ReviewQueueViewSet, basename='review-queue')
 
 
 @ensure_csrf_cookie
@@ -32,10 +38,27 @@ def get_csrf_token(request):
     return JsonResponse({'detail': 'CSRF cookie set'})
 
 
-urlpatterns = [
+# Same URLs on both stacks; under ASGI the read-heavy ones are async views
+if settings.ASYNC_VIEWS:
+    read_urlpatterns = [
+        path('api/search/', async_views.search, name='search'),
+        path('api/decks/', async_views.decks, name='decks'),
+        path('api/chapters/<int:pk>/', async_views.chapter_detail, name='chapter-detail'),
+    ]
+else:
+    read_urlpatterns = [
+        path('api/search/', search, name='search'),
+        path('api/decks/', decks, name='decks'),
+    ]
+
+urlpatterns = read_urlpatterns + [
     path('admin/', admin.site.urls),
+    path('api/progress/summary/', progress_summary, name='progress-summary'),
     path('api/', include(router.urls)),
     path('api-auth/', include('rest_framework.urls')),
     path('health/', health_check, name='health_check'),
+    path('cache/stats/', cache_stats, name='cache_stats'),
+    path('db/pool/', db_pool, name='db_pool'),
+    path('metrics', metrics, name='metrics'),
     path('csrf/', get_csrf_token, name='csrf'),
 ]
@@ -1,7 +1,64 @@
-from rest_framework.decorators import api_view
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden
+from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 
+from common.backends.postgresql.base import stats as connection_stats
+from common.cache import cache_stats as response_cache_stats
+from common.metrics import metrics as request_metrics
+from common.permissions import IsInternal
+
 
 @api_view(['GET'])
 def health_check(request):
     return Response({"status": "healthy"}, status=200)
+
+
+@api_view(['GET'])
+@permission_classes([IsInternal])
+def cache_stats(request):
+    """Response cache hit/miss counters of the process serving the request."""
+    return Response(response_cache_stats())
+
+
+@api_view(['GET'])
+@permission_classes([IsInternal])
+def db_pool(request):
+    """
+    Database connection usage, for sizing workers against max_connections:
+    this process's counters, plus all of the app's sessions on the server
+    (every worker) by state, in use being ``active``.
+    """
+    data = {'process': connection_stats.as_dict()}
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SHOW max_connections')
+            max_connections = int(cursor.fetchone()[0])
+            cursor.execute(
+                """
+                SELECT COALESCE(state, 'unknown'), COUNT(*)
+                FROM pg_stat_activity
+                WHERE datname = current_database() AND application_name = %s
+                GROUP BY 1
+                """,
+                [connection.settings_dict['OPTIONS'].get('application_name', '')]
+            )
+            states = dict(cursor.fetchall())
+        data['server'] = {
+            'max_connections': max_connections,
+            'in_use': states.get('active', 0),
+            'idle': states.get('idle', 0),
+            'idle_in_transaction': states.get('idle in transaction', 0),
+            'total': sum(states.values()),
+        }
+    return Response(data)
+
+
+def metrics(request):
+    """Request metrics of this process in the Prometheus text format."""
+    if not IsInternal().has_permission(request, None):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        request_metrics.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -40,40 +40,20 @@ export function FlashcardGame({ onExit, questionType }: FlashcardGameProps) {
 
   const fetchCards = async (chapters: Chapter[]) => {
     setLoading(true);
-    let allCards: any[] = [];
 
     try {
-      for (const chapter of chapters) {
-        if (questionType === "vocabulary" || questionType === "kanji") {
-          const vocabRes = await fetch(
-            `${API_BASE_URL}/vocabularies/?chapter=${chapter.id}`
-          );
-          if (!vocabRes.ok) {
-            console.error(`Failed to fetch vocabulary for chapter ${chapter.id}:`, vocabRes.statusText);
-            continue;
-          }
-          const vocabData = await vocabRes.json();
-          const chapterCards = vocabData.results || [];
-          console.log(`Fetched ${chapterCards.length} cards from chapter ${chapter.id}`);
-          allCards = [...allCards, ...chapterCards];
-        } else if (questionType === "grammar") {
-          const grammarRes = await fetch(
-            `${API_BASE_URL}/grammar_patterns/?chapter=${chapter.id}`
-          );
-          if (!grammarRes.ok) {
-            console.error(`Failed to fetch grammar for chapter ${chapter.id}:`, grammarRes.statusText);
-            continue;
-          }
-          const grammarData = await grammarRes.json();
-          const chapterCards = grammarData.results || [];
-          console.log(`Fetched ${chapterCards.length} cards from chapter ${chapter.id}`);
-          allCards = [...allCards, ...chapterCards];
-        }
+      // One request for the whole deck; the server shuffles it
+      const cardType = questionType === "grammar" ? "grammar" : "vocabulary";
+      const chapterIds = chapters.map(chapter => chapter.id).join(',');
+      const deckRes = await fetch(
+        `${API_BASE_URL}/decks/?type=${cardType}&chapters=${chapterIds}`
+      );
+      if (!deckRes.ok) {
+        throw new Error(`Failed to fetch deck: ${deckRes.statusText}`);
       }
-
-      // Shuffle all cards
-      allCards = shuffleArray(allCards);
-      console.log(`Total cards after shuffling: ${allCards.length}`);
+      const deck = await deckRes.json();
+      const allCards = deck.cards || [];
+      console.log(`Fetched ${allCards.length} cards from ${chapters.length} chapters`);
 
       setCardList(allCards);
     } catch (error) {
@@ -4,6 +4,12 @@ import { Input } from "@/components/ui/input";
 import { Search } from "lucide-react";
 import { API_BASE_URL } from '@/config';
 
+const SEARCH_TYPE_LABELS: Record<string, string> = {
+  vocabulary: 'Vocabulary',
+  grammar: 'Grammar',
+  note: 'Note',
+};
+
 export function GlobalSearch() {
   const [searchQuery, setSearchQuery] = useState("");
   const [searchResults, setSearchResults] = useState<any[]>([]);
@@ -18,47 +24,19 @@ export function GlobalSearch() {
 
     setIsSearching(true);
     try {
-      // Search all endpoints in parallel
-      const [vocabRes, grammarRes, notesRes] = await Promise.all([
-        fetch(`${API_BASE_URL}/vocabularies/?search=${encodeURIComponent(searchQuery)}`, {
-          method: 'GET',
-          headers: {
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
-          },
-          credentials: 'include',
-        }),
-        fetch(`${API_BASE_URL}/grammar_patterns/?search=${encodeURIComponent(searchQuery)}`, {
-          method: 'GET',
-          headers: {
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
-          },
-          credentials: 'include',
-        }),
-        fetch(`${API_BASE_URL}/notes/?search=${encodeURIComponent(searchQuery)}`, {
-          method: 'GET',
-          headers: {
-            'Accept': 'application/json',
-            'Content-Type': 'application/json',
-          },
-          credentials: 'include',
-        })
-      ]);
-
-      const [vocabData, grammarData, notesData] = await Promise.all([
-        vocabRes.ok ? vocabRes.json() : { results: [] },
-        grammarRes.ok ? grammarRes.json() : { results: [] },
-        notesRes.ok ? notesRes.json() : { results: [] },
-      ]);
-
-      // Add type to each result
-      const vocabResults = (vocabData.results || []).map((item: any) => ({ ...item, _type: 'Vocabulary' }));
-      const grammarResults = (grammarData.results || []).map((item: any) => ({ ...item, _type: 'Grammar' }));
-      const notesResults = (notesData.results || []).map((item: any) => ({ ...item, _type: 'Note' }));
-      console.log('Notes search results:', notesResults);
+      // One ranked request across vocabulary, grammar and notes
+      const response = await fetch(`${API_BASE_URL}/search/?q=${encodeURIComponent(searchQuery)}`, {
+        method: 'GET',
+        headers: {
+          'Accept': 'application/json',
+          'Content-Type': 'application/json',
+        },
+        credentials: 'include',
+      });
+      const data = response.ok ? await response.json() : { results: [] };
 
-      setSearchResults([...vocabResults, ...grammarResults, ...notesResults]);
+      // Add display type to each result
+      setSearchResults((data.results || []).map((item: any) => ({ ...item, _type: SEARCH_TYPE_LABELS[item.type] })));
     } catch (error) {
       console.error("Error searching:", error);
     } finally {
@@ -121,7 +99,7 @@ export function GlobalSearch() {
                   </div>
                   <div className="text-sm text-muted-foreground">
                     {item._type === 'Vocabulary' && item.meaning}
-                    {item._type === 'Grammar' && item.explanation}
+                    {item._type === 'Grammar' && item.description}
                     {item._type === 'Note' && item.content}
                   </div>
                   {item.example && (
@@ -12,8 +12,8 @@ interface Chapter {
   book_name: string;
   order: number;
   level: string;
-  vocabularies: any[];
-  grammar_patterns: any[];
+  vocabulary_count: number;
+  grammar_count: number;
 }
 
 interface ChapterSelectorProps {
@@ -73,8 +73,8 @@ export function ChapterSelector({ onChapterSelect, practiceType }: ChapterSelect
 
   const getContentCount = (chapter: Chapter) => {
     switch (practiceType) {
-      case "vocabulary": return chapter.vocabularies?.length || 0;
-      case "grammar": return chapter.grammar_patterns?.length || 0;
+      case "vocabulary": return chapter.vocabulary_count || 0;
+      case "grammar": return chapter.grammar_count || 0;
       default: return 0;
     }
   };
@@ -22,6 +22,15 @@ interface WordData {
   example: string;
 }
 
+interface BookSummary {
+  book_name: string;
+  chapter_count: number;
+  lowest_level: string;
+  highest_level: string;
+  vocabulary_count: number;
+  grammar_count: number;
+}
+
 interface ImportedChapter {
   level: "N5" | "N4" | "N3" | "N2" | "N1";
   bookName: string;
@@ -107,24 +116,64 @@ export default function Chapters() {
   });
   const [importing, setImporting] = useState(false);
   const [allChapters, setAllChapters] = useState<any[]>([]);
-  
-  // Define fetchChapters function
-  const fetchChapters = async () => {
+  const [books, setBooks] = useState<BookSummary[]>([]);
+  const [selectedBook, setSelectedBook] = useState<string | null>(
+    () => localStorage.getItem('chaptersBook')
+  );
+
+  // The landing page is one request: every book with its counts
+  const fetchBooks = async () => {
+    setLoading(true);
+    setLoadingStatus('Loading books...');
+    try {
+      const response = await fetch(`${API_BASE_URL}/books/`, {
+        method: 'GET',
+        headers: {
+          'Accept': 'application/json',
+        },
+        credentials: 'omit',
+      });
+
+      if (!response.ok) {
+        throw new Error(`Failed to fetch books: ${response.status} ${response.statusText}`);
+      }
+
+      const data: BookSummary[] = await response.json();
+      setBooks(data);
+      const book = data.some(b => b.book_name === selectedBook)
+        ? selectedBook
+        : data[0]?.book_name ?? null;
+      if (book) {
+        await fetchChapters(book, book === selectedBook ? currentPage : 1);
+      } else {
+        setAllChapters([]);
+        setChapters([]);
+        setTotalPages(1);
+      }
+    } catch (error) {
+      console.error("Error fetching books:", error);
+      setError(error.message);
+      setLoadingStatus('Error loading books');
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  // Chapters of one book, loaded when the book is selected
+  const fetchChapters = async (book: string, page: number = 1) => {
     setLoading(true);
-    setLoadingStatus('Loading chapters...');
+    setLoadingStatus(`Loading chapters of ${book}...`);
+    setSelectedBook(book);
+    localStorage.setItem('chaptersBook', book);
     try {
-      console.log('Fetching all chapters...');
-      let allChaptersData: any[] = [];
-      let nextUrl = `${API_BASE_URL}/chapters/?ordering=book_name,chapter_number`;
+      let bookChapters: any[] = [];
+      let nextUrl = `${API_BASE_URL}/chapters/?book_name=${encodeURIComponent(book)}&ordering=chapter_number&page_size=200`;
 
-      // Fetch all pages of chapters
       while (nextUrl) {
-        console.log('Fetching from:', nextUrl);
         const response = await fetch(nextUrl, {
           method: 'GET',
           headers: {
             'Accept': 'application/json',
-            'Content-Type': 'application/json',
           },
           credentials: 'omit',
         });
@@ -134,11 +183,6 @@ export default function Chapters() {
         }
 
         const data = await response.json();
-        console.log('Fetched page of chapters:', {
-          count: data.count,
-          results: data.results.length,
-          next: data.next
-        });
 
         // Transform the API data to match our frontend Chapter type
         const transformedChapters = data.results.map((chapter: any) => ({
@@ -147,30 +191,21 @@ export default function Chapters() {
           chapterNumber: chapter.chapter_number,
           level: chapter.level,
           description: chapter.description,
-          words: chapter.vocabularies || [],
+          words: [],
+          vocabularyCount: chapter.vocabulary_count,
+          grammarCount: chapter.grammar_count,
           exercises: [],
-          grammar_patterns: chapter.grammar_patterns || []
+          grammar_patterns: []
         }));
 
-        allChaptersData = [...allChaptersData, ...transformedChapters];
+        bookChapters = [...bookChapters, ...transformedChapters];
         nextUrl = data.next;
       }
 
-      // Sort all chapters by book name and chapter number
-      setLoadingStatus('Sorting chapters...');
-      const sortedChapters = allChaptersData.sort((a, b) => {
-        if (a.bookName !== b.bookName) {
-          return a.bookName.localeCompare(b.bookName);
-        }
-        return a.chapterNumber - b.chapterNumber;
-      });
-
-      console.log('Total chapters fetched:', sortedChapters.length);
-      console.log('Books found:', [...new Set(sortedChapters.map(c => c.bookName))]);
-      
-      setAllChapters(sortedChapters);
-      setTotalPages(Math.ceil(sortedChapters.length / pageSize));
-      updateDisplayedChapters(currentPage, sortedChapters);
+      const pages = Math.max(1, Math.ceil(bookChapters.length / pageSize));
+      setAllChapters(bookChapters);
+      setTotalPages(pages);
+      updateDisplayedChapters(Math.min(page, pages), bookChapters);
     } catch (error) {
       console.error("Error fetching chapters:", error);
       setError(error.message);
@@ -190,9 +225,8 @@ export default function Chapters() {
     localStorage.setItem('chaptersPage', page.toString());
   };
 
-  // Update useEffect to fetch all chapters on mount
   useEffect(() => {
-    fetchChapters();
+    fetchBooks();
   }, []);
 
   const handleAddWord = () => {
@@ -512,224 +546,63 @@ export default function Chapters() {
     });
 
     try {
-      // Read the Excel file
-      const reader = new FileReader();
-      reader.onload = async (e) => {
-        try {
-          const fileData = new Uint8Array(e.target?.result as ArrayBuffer);
-          const workbook = XLSX.read(fileData, { type: 'array' });
-          
-          console.log('Total sheets found:', workbook.SheetNames.length);
-          console.log('Sheet names:', workbook.SheetNames);
-          
-          setImportProgress(prev => ({
-            ...prev,
-            totalSheets: workbook.SheetNames.length,
-            status: 'Fetching existing chapters...'
-          }));
-          
-          // First, get all existing chapters for this book
-          const existingChaptersResponse = await fetch(
-            `${API_BASE_URL}/chapters/?book_name=${encodeURIComponent(importingChapter.bookName)}`,
-            {
-              method: 'GET',
-              headers: {
-                'Accept': 'application/json',
-                'Content-Type': 'application/json',
-              },
-              credentials: 'omit',  // Don't send credentials
-            }
-          );
-          
-          if (!existingChaptersResponse.ok) {
-            throw new Error('Failed to fetch existing chapters');
-          }
-          
-          const existingChaptersData = await existingChaptersResponse.json();
-          const existingChapters = existingChaptersData.results || [];
-          console.log('Existing chapters:', existingChapters);
-          
-          let totalImported = 0;
-          let totalWords = 0;
-          let createdChapters = 0;
-          let skippedSheets = 0;
-          
-          for (let sheetIndex = 0; sheetIndex < workbook.SheetNames.length; sheetIndex++) {
-            const sheetName = workbook.SheetNames[sheetIndex];
-            console.log(`Processing sheet ${sheetIndex + 1}/${workbook.SheetNames.length}: ${sheetName}`);
-            
-            // Extract chapter number from sheet name (e.g., "Chapter 26" -> 26)
-            const chapterNumberMatch = sheetName.match(/Chapter\s+(\d+)/i);
-            const chapterNumber = chapterNumberMatch ? parseInt(chapterNumberMatch[1]) : sheetIndex + 1;
-            console.log(`Extracted chapter number ${chapterNumber} from sheet name ${sheetName}`);
-            
-            const worksheet = workbook.Sheets[sheetName];
-            const jsonData = XLSX.utils.sheet_to_json(worksheet);
-            console.log(`Found ${jsonData.length} vocabulary entries in sheet ${sheetName}`);
-            
-            setImportProgress(prev => ({
-              ...prev,
-              currentSheet: sheetIndex + 1,
-              totalWords: jsonData.length,
-              status: `Processing sheet ${sheetName} (Chapter ${chapterNumber})`
-            }));
-
-            // Find or create chapter
-            let createdChapter;
-            const existingChapter = existingChapters.find(
-              (chapter: any) => chapter.chapter_number === chapterNumber
-            );
-
-            if (existingChapter) {
-              console.log(`Found existing chapter ${chapterNumber} (${sheetName}) with ID: ${existingChapter.id}`);
-              createdChapter = existingChapter;
-            } else {
-              setImportProgress(prev => ({
-                ...prev,
-                status: `Creating new chapter ${chapterNumber} for sheet ${sheetName}`
-              }));
-
-              console.log(`Creating new chapter ${chapterNumber} for sheet ${sheetName}`);
-              const chapterData = {
-                level: importingChapter.level,
-                book_name: importingChapter.bookName,
-                chapter_number: chapterNumber,
-                description: `${importingChapter.description || ""} - ${sheetName}`,
-              };
-              
-              try {
-                const chapterResponse = await fetch(`${API_BASE_URL}/chapters/`, {
-                  method: 'POST',
-                  headers: {
-                    'Accept': 'application/json',
-                    'Content-Type': 'application/json',
-                  },
-                  credentials: 'omit',  // Don't send credentials
-                  body: JSON.stringify(chapterData),
-                });
-                
-                if (!chapterResponse.ok) {
-                  console.warn(`Failed to create chapter ${chapterNumber} for sheet ${sheetName}: ${chapterResponse.status}`);
-                  const errorData = await chapterResponse.json();
-                  console.error('Chapter creation error:', errorData);
-                  continue;
-                }
-                
-                createdChapter = await chapterResponse.json();
-                console.log(`Created new chapter ${chapterNumber} for sheet ${sheetName} with ID: ${createdChapter.id}`);
-                createdChapters++;
-              } catch (error) {
-                console.warn(`Error creating chapter ${chapterNumber}: ${error.message}`);
-                continue;
-              }
-            }
-
-            // Create vocabulary words
-            if (createdChapter && jsonData.length > 0) {
-              setImportProgress(prev => ({
-                ...prev,
-                status: `Importing vocabulary for chapter ${chapterNumber}`
-              }));
-
-              for (let i = 0; i < jsonData.length; i++) {
-                const row = jsonData[i] as Record<string, any>;
-                setImportProgress(prev => ({
-                  ...prev,
-                  currentWord: i + 1,
-                  status: `Importing word ${i + 1}/${jsonData.length} for chapter ${chapterNumber}`
-                }));
-
-                // Find word and meaning columns
-                const wordColumn = Object.keys(row).find(key => 
-                  key.toLowerCase().includes('word') || 
-                  key.toLowerCase().includes('từ') || 
-                  key.toLowerCase().includes('vocabulary')
-                );
-                const meaningColumn = Object.keys(row).find(key => 
-                  key.toLowerCase().includes('meaning') || 
-                  key.toLowerCase().includes('nghĩa') || 
-                  key.toLowerCase().includes('definition')
-                );
-
-                if (!wordColumn || !meaningColumn) {
-                  console.warn(`Skipping row ${i + 1} in sheet ${sheetName}: Missing word or meaning column`);
-                  continue;
-                }
-
-                const word = String(row[wordColumn]).trim();
-                const meaning = String(row[meaningColumn]).trim();
-
-                if (!word || !meaning) {
-                  console.warn(`Skipping row ${i + 1} in sheet ${sheetName}: Empty word or meaning`);
-                  continue;
-                }
-
-                try {
-                  const vocabularyData = {
-                    word: word,
-                    meaning: meaning,
-                    example: (row.example || row.translation || "") as string,
-                    chapter: createdChapter.id
-                  };
-
-                  const vocabularyResponse = await fetch(`${API_BASE_URL}/vocabularies/`, {
-                    method: 'POST',
-                    headers: {
-                      'Accept': 'application/json',
-                      'Content-Type': 'application/json',
-                    },
-                    credentials: 'omit',  // Don't send credentials
-                    body: JSON.stringify(vocabularyData),
-                  });
-
-                  if (!vocabularyResponse.ok) {
-                    console.warn(`Failed to create vocabulary for word "${word}": ${vocabularyResponse.status}`);
-                    continue;
-                  }
-
-                  totalImported++;
-                } catch (error) {
-                  console.warn(`Error creating vocabulary for word "${word}": ${error.message}`);
-                  continue;
-                }
-              }
-            }
-          }
+      // The server streams the workbook and bulk-inserts every sheet in one
+      // transaction, so the whole book is a single request.
+      const formData = new FormData();
+      formData.append('file', selectedFile);
+      formData.append('book_name', importingChapter.bookName);
+      formData.append('level', importingChapter.level);
 
-          setImportProgress(prev => ({
-            ...prev,
-            status: `Import completed. Created ${createdChapters} chapters, imported ${totalImported} words.`
-          }));
+      setImportProgress(prev => ({
+        ...prev,
+        status: 'Uploading file...'
+      }));
 
-          // Refresh the chapters list
-          fetchChapters();
-          
-          // Close the import dialog after a delay
-          setTimeout(() => {
-            setImportDialogOpen(false);
-            setImporting(false);
-            setImportProgress({
-              currentSheet: 0,
-              totalSheets: 0,
-              currentWord: 0,
-              totalWords: 0,
-              status: ''
-            });
-          }, 2000);
+      const response = await fetch(`${API_BASE_URL}/vocabularies/import/`, {
+        method: 'POST',
+        headers: {
+          'Accept': 'application/json',
+        },
+        credentials: 'omit',  // Don't send credentials
+        body: formData,
+      });
+      const report = await response.json();
 
-        } catch (error) {
-          console.error("Error importing vocabulary:", error);
-          setImportProgress(prev => ({
-            ...prev,
-            status: `Error: ${error.message}`
-          }));
-          setImporting(false);
-        }
-      };
-      
-      reader.readAsArrayBuffer(selectedFile);
+      if (!response.ok) {
+        throw new Error(report.error || `Import failed: ${response.status}`);
+      }
+
+      report.sheets.forEach((sheet: any) => {
+        sheet.failed.forEach((failure: any) => {
+          console.warn(`Skipped row ${failure.row} in sheet ${sheet.sheet}: ${failure.error}`);
+        });
+      });
+
+      setImportProgress({
+        currentSheet: report.sheets.length,
+        totalSheets: report.sheets.length,
+        currentWord: report.created,
+        totalWords: report.created + report.failed,
+        status: `Import completed. Created ${report.chapters_created} chapters, imported ${report.created} words, skipped ${report.failed} rows.`
+      });
+
+      // Refresh the books (the import may have added one) and chapters
+      fetchBooks();
+
+      // Close the import dialog after a delay
+      setTimeout(() => {
+        setImportDialogOpen(false);
+        setImporting(false);
+        setImportProgress({
+          currentSheet: 0,
+          totalSheets: 0,
+          currentWord: 0,
+          totalWords: 0,
+          status: ''
+        });
+      }, 2000);
     } catch (error) {
-      console.error("Error reading file:", error);
+      console.error("Error importing vocabulary:", error);
       setImportProgress(prev => ({
         ...prev,
         status: `Error: ${error.message}`
@@ -1071,6 +944,25 @@ export default function Chapters() {
           </div>
         </div>
         
+        {books.length > 0 && (
+          <div className="flex flex-col sm:flex-row sm:items-center gap-2">
+            <Label htmlFor="bookSelect">Book</Label>
+            <Select value={selectedBook ?? undefined} onValueChange={(book) => fetchChapters(book)}>
+              <SelectTrigger id="bookSelect" className="sm:w-96">
+                <SelectValue placeholder="Select a book" />
+              </SelectTrigger>
+              <SelectContent>
+                {books.map((book) => (
+                  <SelectItem key={book.book_name} value={book.book_name}>
+                    {book.book_name} · {book.chapter_count} chapters · {book.vocabulary_count} words · {book.grammar_count} grammars
+                    {book.lowest_level && ` · ${book.lowest_level === book.highest_level ? book.lowest_level : `${book.lowest_level}–${book.highest_level}`}`}
+                  </SelectItem>
+                ))}
+              </SelectContent>
+            </Select>
+          </div>
+        )}
+
         {loading && (
           <div className="flex flex-col items-center justify-center py-12">
             <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-primary"></div>
@@ -1104,36 +996,20 @@ export default function Chapters() {
                     <CardDescription className="line-clamp-2">{chapter.description}</CardDescription>
                     <div className="flex flex-wrap gap-2">
                       <span className="px-2 py-1 text-xs bg-secondary text-secondary-foreground rounded-full">
-                        {chapter.words?.length || 0} words
+                        {chapter.vocabularyCount ?? chapter.words?.length ?? 0} words
                       </span>
                       <span className="px-2 py-1 text-xs bg-indigo-100 text-indigo-700 rounded-full">
-                        {chapter.grammar_patterns?.length || 0} grammars
+                        {chapter.grammarCount ?? chapter.grammar_patterns?.length ?? 0} grammars
                       </span>
                     </div>
                   </CardHeader>
                   <CardContent className="p-4 sm:p-6">
-                    <div className="flex items-center space-x-2 text-sm mb-4">
+                    <div className="flex items-center space-x-2 text-sm">
                       <BookOpen className="h-4 w-4 text-muted-foreground" />
                       <span className="text-muted-foreground">
                         {chapter.exercises.length} Exercise{chapter.exercises.length !== 1 ? 's' : ''}
                       </span>
                     </div>
-                    
-                    {chapter.words && chapter.words.length > 0 && (
-                      <div className="space-y-2">
-                        <h4 className="text-sm font-medium">Sample Words:</h4>
-                        {chapter.words.slice(0, 3).map((word, index) => (
-                          <div key={index} className="p-2 bg-secondary/20 rounded-md text-sm">
-                            <strong>{word.word}</strong> - {word.meaning}
-                          </div>
-                        ))}
-                        {chapter.words.length > 3 && (
-                          <div className="text-sm text-muted-foreground text-right">
-                            +{chapter.words.length - 3} more words
-                          </div>
-                        )}
-                      </div>
-                    )}
                   </CardContent>
                   <CardFooter className="bg-white pt-0">
                     <div className="flex flex-wrap gap-2 w-full">
@@ -36,7 +36,7 @@ export default function ManageInputTestQuestions() {
 
   // Fetch all questions on mount and after import
   const fetchAllQuestions = async () => {
-    let url = `${API_BASE_URL}/input-test-questions/`;
+    let url = `${API_BASE_URL}/input-test-questions/?pagination=cursor&page_size=1000`;
     let allQuestions: any[] = [];
     while (url) {
       const res = await fetch(url);
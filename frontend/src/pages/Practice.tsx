@@ -14,6 +14,7 @@ import { API_BASE_URL } from '@/config';
 interface Book {
   id: number;
   name: string;
+  chapterCount: number;
 }
 
 interface Chapter {
@@ -73,23 +74,19 @@ export default function Practice() {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
-  // Fetch books
+  // Fetch books (one row per book, with its counts)
   useEffect(() => {
-    fetch(`${API_BASE_URL}/chapters/`)
+    fetch(`${API_BASE_URL}/books/`)
       .then(res => res.json())
       .then(data => {
-        // Get unique book names
-        const bookNames = Array.from(new Set(data.results.map((c: any) => c.book_name)));
-        // Map to objects with id and name (use name as id if no real id)
-        const uniqueBooks = bookNames.map((name: string, idx: number) => ({ id: idx, name: String(name) }));
-        setBooks(uniqueBooks);
+        setBooks(data.map((book: any, idx: number) => ({ id: idx, name: book.book_name, chapterCount: book.chapter_count })));
       });
   }, []);
 
   // Fetch chapters for selected book
   useEffect(() => {
     if (!selectedBook) return;
-    fetch(`${API_BASE_URL}/chapters/?book_name=${encodeURIComponent(selectedBook)}`)
+    fetch(`${API_BASE_URL}/chapters/?book_name=${encodeURIComponent(selectedBook)}&ordering=chapter_number&page_size=200`)
       .then(res => res.json())
       .then(data => setChapters(data.results));
   }, [selectedBook]);
@@ -176,7 +173,7 @@ export default function Practice() {
                 >
                   <option value="">Select Book</option>
                   {books.map((book, idx) => (
-                    <option key={book.id ?? book.name ?? idx} value={book.name}>{book.name}</option>
+                    <option key={book.id ?? book.name ?? idx} value={book.name}>{book.name} ({book.chapterCount} chapters)</option>
                   ))}
                 </select>
               </div>
@@ -6,6 +6,8 @@ export interface Chapter {
   bookName?: string;
   chapterNumber?: number;
   words?: WordData[];
+  vocabularyCount?: number;
+  grammarCount?: number;
   exercises: Exercise[];
   grammar_patterns?: Grammar[];
 }